@@ -9,6 +9,87 @@ sys.path.insert(0, str(Path(__file__).parent))
 from fake_useragent import UserAgent
 from playwright.async_api import async_playwright
 
+# UserAgent() loads its browser data on construction; build it once per process
+_UA_POOL = UserAgent()
+
+# Login check, comment keywords, candidate text blocks and interesting CSS
+# classes, collected in one page.evaluate call
+_INSPECT_JS = """() => {
+    // innerText forces a layout flush, so read it (and innerHTML) only once
+    const bodyText = document.body.innerText;
+    const lowerText = bodyText.toLowerCase();
+    const htmlLength = document.body.innerHTML.length;
+
+    // Login indicators
+    const loginIndicators = [
+        bodyText.includes('登录'),
+        bodyText.includes('Login'),
+        document.querySelector('[class*="login"]'),
+        document.querySelector('#login'),
+        document.querySelector('.login-btn'),
+    ];
+    const login = {
+        hasLogin: loginIndicators.some(Boolean),
+        bodyTextLength: bodyText.length,
+        bodyHTMLLength: htmlLength
+    };
+
+    // Comment-related keywords, found with a single scan of the text
+    const keywordList = [
+        '评论', 'comment', '说点什么', '留言',
+        '回复', 'reply', '点赞', '喜欢'
+    ];
+    const hits = new Set(lowerText.match(new RegExp(keywordList.join('|'), 'g')));
+    const keywords = keywordList.map(kw => ({
+        keyword: kw,
+        found: hits.has(kw)
+    }));
+
+    // One DOM pass for both text blocks and div class tokens
+    const blocks = [];
+    const classes = new Set();
+    const interactionRe = /like|reply|digg/i;
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT);
+    let el;
+
+    while ((el = walker.nextNode())) {
+        const className = typeof el.className === 'string' ? el.className : '';
+
+        if (el.tagName === 'DIV' && className) {
+            className.split(/\\s+/).forEach(cls => classes.add(cls));
+        }
+
+        if (blocks.length >= 20) continue;
+
+        const text = el.textContent?.trim();
+        if (text && text.length > 5 && text.length < 200) {
+            // Check if it might be user-generated content
+            const parent = el.parentElement;
+            const parentClass = parent && typeof parent.className === 'string'
+                ? parent.className : '';
+            const hasInteraction = interactionRe.test(parentClass);
+
+            if (hasInteraction) {
+                blocks.push({
+                    text: text.substring(0, 100),
+                    tag: el.tagName,
+                    class: className.substring(0, 50)
+                });
+            }
+        }
+    }
+
+    const matchedClasses = Array.from(classes).filter(cls => {
+        const lower = cls.toLowerCase();
+        return lower.includes('comment') ||
+            lower.includes('reply') ||
+            lower.includes('list') ||
+            lower.includes('item');
+    }).slice(0, 30);
+
+    return {login, keywords, blocks, classes: matchedClasses};
+}"""
+
 
 async def debug_page(url: str):
     """Debug and inspect the page structure."""
@@ -18,7 +99,7 @@ async def debug_page(url: str):
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
         context = await browser.new_context(
-            user_agent=UserAgent().random,
+            user_agent=_UA_POOL.random,
             viewport={"width": 1920, "height": 1080},
             locale="zh-CN",
         )
@@ -26,8 +107,16 @@ async def debug_page(url: str):
         page = await context.new_page()
 
         print("📄 加载页面...")
-        await page.goto(url, timeout=60000, wait_until="networkidle")
-        await page.wait_for_timeout(5000)
+        await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+
+        # Douyin keeps firing telemetry, so wait for the comment root instead
+        # of network idle
+        try:
+            await page.wait_for_selector(
+                '[data-e2e="comment-list"], [class*="CommentItem"]', timeout=10000
+            )
+        except Exception:
+            print("⚠️  未检测到评论区，继续检查页面...")
 
         # 1. Get page title
         title = await page.title()
@@ -37,102 +126,31 @@ async def debug_page(url: str):
         current_url = page.url
         print(f"🔗 当前URL: {current_url}")
 
-        # 3. Check for login requirement
-        login_check = await page.evaluate("""() => {
-            const loginIndicators = [
-                document.body.innerText.includes('登录'),
-                document.body.innerText.includes('Login'),
-                document.querySelector('[class*="login"]'),
-                document.querySelector('#login'),
-                document.querySelector('.login-btn'),
-            ];
-            return {
-                hasLogin: loginIndicators.some(x => x === true),
-                bodyTextLength: document.body.innerText.length,
-                bodyHTMLLength: document.body.innerHTML.length
-            };
-        }""")
+        # 3-6. Inspect the DOM in a single round trip
+        inspect = await page.evaluate(_INSPECT_JS)
+        login_check = inspect["login"]
 
         print(f"\n🔐 登录检查:")
         print(f"   - 需要登录: {'是' if login_check['hasLogin'] else '否'}")
         print(f"   - 页面文本长度: {login_check['bodyTextLength']}")
         print(f"   - 页面HTML长度: {login_check['bodyHTMLLength']}")
 
-        # 4. Search for comment-related keywords
-        comment_check = await page.evaluate("""() => {
-            const bodyText = document.body.innerText.toLowerCase();
-            const keywords = [
-                '评论', 'comment', '说点什么', '留言',
-                '回复', 'reply', '点赞', '喜欢'
-            ];
-            return keywords.map(kw => ({
-                keyword: kw,
-                found: bodyText.includes(kw)
-            }));
-        }""")
-
         print(f"\n💬 评论关键词检查:")
-        found_keywords = [ck for ck in comment_check if ck['found']]
+        found_keywords = [ck for ck in inspect["keywords"] if ck['found']]
         for ck in found_keywords[:10]:
             print(f"   - 找到: {ck['keyword']}")
 
         if not found_keywords:
             print("   - 未找到评论相关关键词")
 
-        # 5. Try to find any text blocks
-        text_blocks = await page.evaluate("""() => {
-            const allElements = document.querySelectorAll('*');
-            const textBlocks = [];
-
-            for (let el of allElements) {
-                const text = el.textContent?.trim();
-                if (text && text.length > 5 && text.length < 200) {
-                    // Check if it might be user-generated content
-                    const parent = el.parentElement;
-                    const hasInteraction = parent && (
-                        parent.querySelector('[class*="like"]') ||
-                        parent.querySelector('[class*="reply"]') ||
-                        parent.querySelector('[class*="digg"]') ||
-                        parent.querySelector('button')
-                    );
-
-                    if (hasInteraction) {
-                        textBlocks.push({
-                            text: text.substring(0, 100),
-                            tag: el.tagName,
-                            class: el.className?.substring(0, 50)
-                        });
-                    }
-                }
-            }
-
-            return textBlocks.slice(0, 20);
-        }""")
-
         print(f"\n📝 潜在文本块 (前20):")
-        for i, block in enumerate(text_blocks[:10], 1):
+        for i, block in enumerate(inspect["blocks"][:10], 1):
             print(f"   {i}. <{block['tag']}> {block['text'][:60]}...")
             if block['class']:
                 print(f"      class: {block['class'][:40]}")
 
-        # 6. Get all div classes
-        all_classes = await page.evaluate("""() => {
-            const classes = new Set();
-            document.querySelectorAll('div').forEach(div => {
-                if (div.className) {
-                    div.className.split(/\\s+/).forEach(cls => classes.add(cls));
-                }
-            });
-            return Array.from(classes).filter(cls => 
-                cls.toLowerCase().includes('comment') || 
-                cls.toLowerCase().includes('reply') ||
-                cls.toLowerCase().includes('list') ||
-                cls.toLowerCase().includes('item')
-            ).slice(0, 30);
-        }""")
-
         print(f"\n🏷️  包含关键词的CSS类:")
-        for cls in all_classes[:15]:
+        for cls in inspect["classes"][:15]:
             print(f"   - {cls}")
 
         # 7. Take a screenshot
@@ -143,9 +161,10 @@ async def debug_page(url: str):
 
         # 8. Save page HTML
         html_path = Path("output") / "debug_page.html"
-        with open(html_path, "w", encoding="utf-8") as f:
-            html_content = await page.content()
-            f.write(html_content)
+        # Encode once and write the bytes off the event loop
+        html_bytes = (await page.content()).encode("utf-8")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, html_path.write_bytes, html_bytes)
         print(f"📄 页面HTML已保存: {html_path}")
 
         await browser.close()
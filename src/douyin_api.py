@@ -1,8 +1,10 @@
 """Douyin API-based comment scraper."""
 
 import asyncio
-import json
+import logging
+import os
 import random
+import re
 import sys
 import time
 from datetime import datetime
@@ -10,23 +12,129 @@ from pathlib import Path
 from typing import List, Dict, Optional
 
 import httpx
+import orjson
 from fake_useragent import UserAgent
 
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Matches both ``?modal_id=<id>`` and ``/video/<id>`` URL forms
+_VIDEO_ID_RE = re.compile(r"(?:modal_id=|/video/)([0-9]+)")
+
+# UserAgent() loads its browser data on construction; build it once per process
+_UA_POOL = UserAgent()
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by all concurrent requests."""
+
+    def __init__(self, requests_per_second: float = 5):
+        """Initialize rate limiter.
+
+        Args:
+            requests_per_second: Sustained request rate (also the burst size)
+        """
+        self.rate = requests_per_second
+        self.capacity = max(1.0, requests_per_second)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request token is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _FetchWindow:
+    """Stop point shared by concurrent page workers."""
+
+    def __init__(self, fetched: int, max_comments: Optional[int]):
+        self.fetched = fetched
+        self.max_comments = max_comments
+        self.end_cursor: Optional[int] = None  # No page past this is needed
+
+    def is_full(self) -> bool:
+        """Whether enough comments have been fetched."""
+        return bool(self.max_comments) and self.fetched >= self.max_comments
+
+    def is_past_end(self, cursor: int) -> bool:
+        """Whether the page at ``cursor`` no longer needs to be requested."""
+        return self.end_cursor is not None and cursor > self.end_cursor
+
+    def close_at(self, cursor: int):
+        """Mark ``cursor`` as the last page worth fetching."""
+        if self.end_cursor is None or cursor < self.end_cursor:
+            self.end_cursor = cursor
+
 
 class DouyinAPIScraper:
     """Douyin comment scraper using internal API."""
 
-    def __init__(self):
-        """Initialize API scraper."""
+    def __init__(self, concurrency: int = 10, requests_per_second: float = 5):
+        """Initialize API scraper.
+
+        Args:
+            concurrency: Maximum number of comment pages fetched in parallel
+            requests_per_second: Global request rate across all workers
+        """
         self.base_url = "https://www.douyin.com"
         self.api_url = "https://www.douyin.com/aweme/v1/web/comment/list/"
         self.timeout = 30
-        self.user_agent = UserAgent().random
-        self.cookies = {}  # Will be populated from page load
+        self.concurrency = concurrency
+        self.page_size = 20
+        self.max_pages = 50
+        self.client: Optional[httpx.AsyncClient] = None
+        self.limiter = RateLimiter(requests_per_second)
+        # One UA per scraper so it stays consistent with the session cookies
+        self.user_agent = _UA_POOL.random
+
+        # Per-scrape output state
+        self._sink = None
+        self.total_comments = 0
+        self.total_likes = 0
+        self.preview: List[dict] = []
+
+    async def __aenter__(self):
+        """Open the shared HTTP/2 client used for every request."""
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=10.0),
+            # Retries are handled at the application level
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=64, max_connections=128
+                ),
+                retries=0,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared HTTP client."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
 
     async def scrape(self, video_url: str, max_comments: Optional[int] = None) -> dict:
         """Scrape comments using API approach.
 
+        The first page is fetched serially to confirm there is more data;
+        the remaining pages are then fetched concurrently, bounded by
+        ``self.concurrency``.
+
         Args:
             video_url: Douyin video URL
             max_comments: Maximum comments to scrape
@@ -47,13 +155,28 @@ class DouyinAPIScraper:
 
         print(f"🎥 视频 ID: {video_id}")
 
-        comments = []
-        cursor = "0"
+        client = self.client
+        if client is None:
+            raise RuntimeError(
+                "DouyinAPIScraper must be used as an async context manager"
+            )
+
+        # Comments are appended to a JSONL file as they arrive, so peak memory
+        # stays flat and an interrupted scrape keeps what it fetched so far
+        stem = f"douyin_api_{video_id}_{int(time.time())}"
+        comments_file = Path("output") / f"{stem}.jsonl"
+        output_file = comments_file.with_suffix(".json")
+        comments_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self.total_comments = 0
+        self.total_likes = 0
+        self.preview = []
         page_count = 0
-        max_pages = 50
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            with open(comments_file, "ab") as sink:
+                self._sink = sink
+
                 # First, try to get initial cookies
                 print("\n🔄 获取初始cookies...")
                 await self._get_initial_cookies(client, video_url)
@@ -61,120 +184,290 @@ class DouyinAPIScraper:
                 # Fetch comments with pagination
                 print("🔄 开始获取评论...\n")
 
-                while page_count < max_pages:
-                    if max_comments and len(comments) >= max_comments:
+                data = await self._fetch_page(client, video_id, "0")
+
+                if data is None:
+                    # Try alternative approach
+                    print("\n🔄 尝试备用API端点...")
+                    alt_comments = await self._try_alternative_api(client, video_id)
+                    if alt_comments:
+                        self._store_comments(alt_comments)
+                        page_count = 1
+                elif not data.get("aweme_comments"):
+                    print("   ⚠️  无评论数据")
+                    print(f"   响应结构: {list(data.keys())}")
+                else:
+                    new_comments = self._parse_comments(
+                        data["aweme_comments"], video_id
+                    )
+                    self._store_comments(new_comments)
+                    page_count = 1
+                    logger.debug("   ✅ 获取 %d 条", len(new_comments))
+
+                    cursor = data.get("cursor")
+                    has_more = data.get("has_more", True)
+
+                    if not cursor or not has_more:
+                        print("   ℹ️  无更多页")
+                    elif max_comments and self.total_comments >= max_comments:
                         print(f"✅ 已达到目标评论数: {max_comments}")
-                        break
+                    else:
+                        page_count += await self._fetch_remaining_pages(
+                            client, video_id, int(cursor), max_comments
+                        )
 
-                    # Build API request
-                    params = {
-                        "aweme_id": video_id,
-                        "count": "20",
-                        "cursor": cursor,
-                    }
+        except Exception as e:
+            print(f"\n❌ 爬取失败: {e}")
+            import traceback
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+        finally:
+            self._sink = None
 
-                    headers = {
-                        "User-Agent": self.user_agent,
-                        "Referer": f"{self.base_url}/",
-                        "Cookie": self._format_cookies(),
-                    }
+        # Prepare result
+        result = {
+            "video_url": video_url,
+            "video_id": video_id,
+            "total_comments": self.total_comments,
+            "total_likes": self.total_likes,
+            "comments_file": str(comments_file),
+            "pages_loaded": page_count,
+            "scraped_at": datetime.now().isoformat(),
+            "scraper_version": "2.0.0",
+            "success": self.total_comments > 0,
+        }
 
-                    print(f"📥 获取第 {page_count + 1} 页... (cursor: {cursor})")
+        # Save run metadata next to the comments file
+        self._write_json_atomic(output_file, result)
 
-                    try:
-                        response = await client.get(
-                            self.api_url, params=params, headers=headers
-                        )
+        self._print_summary(result, output_file)
 
-                        print(f"   状态码: {response.status_code}")
-                        print(f"   响应长度: {len(response.content)} 字节")
+        return result
 
-                        if response.status_code != 200:
-                            print(f"   ⚠️  HTTP错误: {response.status_code}")
-                            print(f"   响应: {response.text[:200]}")
+    @staticmethod
+    def _write_json_atomic(output_file: Path, data: dict):
+        """Write JSON to a temp file, then os.replace it over the target."""
+        tmp_file = output_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, output_file)
+
+    def _store_comments(self, comments: List[dict]):
+        """Append parsed comments to the JSONL sink and update running totals."""
+        write = self._sink.write
+        for comment in comments:
+            write(orjson.dumps(comment) + b"\n")
+        self._sink.flush()
+
+        self.total_comments += len(comments)
+        self.total_likes += sum(c.get("likes", 0) for c in comments)
+
+        # Keep only what the summary prints
+        missing = 10 - len(self.preview)
+        if missing > 0:
+            self.preview.extend(comments[:missing])
+
+    async def _fetch_page(
+        self, client: httpx.AsyncClient, video_id: str, cursor: str
+    ) -> Optional[dict]:
+        """Fetch and decode a single comment page.
 
-                            # Try alternative approach
-                            if page_count == 0:
-                                print("\n🔄 尝试备用API端点...")
-                                alt_result = await self._try_alternative_api(
-                                    client, video_id, max_comments
-                                )
-                                if alt_result["success"]:
-                                    return alt_result
+        Returns:
+            Decoded response data, or None if the request failed
+        """
+        params = {
+            "aweme_id": video_id,
+            "count": str(self.page_size),
+            "cursor": cursor,
+        }
 
-                            break
+        headers = {
+            "User-Agent": self.user_agent,
+            "Referer": f"{self.base_url}/",
+        }
 
-                        data = response.json()
+        logger.debug("📥 获取评论页... (cursor: %s)", cursor)
 
-                        # Check response structure
-                        if not data.get("aweme_comments"):
-                            print("   ⚠️  无评论数据")
-                            print(f"   响应结构: {list(data.keys())}")
-                            break
+        try:
+            response = await self._fetch_with_retry(
+                client, self.api_url, params, headers
+            )
+        except httpx.TimeoutException:
+            logger.warning("   ⚠️  请求超时 (cursor: %s)", cursor)
+            return None
+        except Exception as e:
+            logger.warning("   ⚠️  错误: %s", e)
+            return None
 
-                        comments_list = data.get("aweme_comments", [])
+        # Stay in bytes: orjson parses them directly and only a short
+        # snippet is ever decoded, for the debug log
+        raw = response.content
 
-                        if not comments_list:
-                            print("   ℹ️  已无更多评论")
-                            break
+        logger.debug("   状态码: %s", response.status_code)
+        logger.debug("   响应长度: %d 字节", len(raw))
 
-                        # Process comments
-                        new_comments = self._parse_comments(comments_list, video_id)
-                        comments.extend(new_comments)
+        if response.status_code != 200:
+            logger.warning("   ⚠️  HTTP错误: %s", response.status_code)
+            logger.debug("   响应: %s", raw[:200].decode("utf-8", errors="replace"))
+            return None
 
-                        print(f"   ✅ 获取 {len(new_comments)} 条 (总计: {len(comments)})")
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            logger.warning("   ⚠️  JSON解析错误: %s", e)
+            logger.debug(
+                "   响应内容: %s", raw[:200].decode("utf-8", errors="replace")
+            )
+            return None
 
-                        # Get next cursor
-                        cursor = data.get("cursor", "")
-                        if not cursor:
-                            print("   ℹ️  无更多页")
-                            break
+    async def _fetch_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict,
+        headers: dict,
+        retries: int = 4,
+    ) -> httpx.Response:
+        """GET a URL, retrying timeouts and 429/5xx with exponential backoff.
 
-                        page_count += 1
+        Each attempt takes a rate-limiter token. On 429 the ``Retry-After``
+        header is honored when present.
 
-                        # Rate limiting delay
-                        delay = random.uniform(0.5, 1.5)
-                        await asyncio.sleep(delay)
+        Returns:
+            The last response received (possibly still an error status)
+        """
+        for attempt in range(retries + 1):
+            await self.limiter.acquire()
 
-                    except httpx.TimeoutException:
-                        print("   ⚠️  请求超时")
-                        break
-                    except json.JSONDecodeError as e:
-                        print(f"   ⚠️  JSON解析错误: {e}")
-                        print(f"   响应内容: {response.text[:200]}")
-                        break
-                    except Exception as e:
-                        print(f"   ⚠️  错误: {e}")
-                        break
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.TimeoutException:
+                if attempt == retries:
+                    raise
+                retry_after = None
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or (
+                    attempt == retries
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+
+            delay = min(30, 0.5 * 2**attempt + random.random())
+            if retry_after:
+                try:
+                    delay = min(30, float(retry_after))
+                except ValueError:
+                    pass
+
+            logger.debug("   🔁 第%d次重试, 等待 %.1fs...", attempt + 1, delay)
+            await asyncio.sleep(delay)
+
+    async def _fetch_comments_page(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        window: "_FetchWindow",
+        video_id: str,
+        cursor: int,
+    ) -> Optional[List[dict]]:
+        """Fetch and parse one page while holding a concurrency slot.
+
+        Pages past the window's end are skipped without a request.
 
-        except Exception as e:
-            print(f"\n❌ 爬取失败: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"success": False, "error": str(e)}
+        Returns:
+            Parsed comments (possibly empty when every raw comment was
+            filtered out), or None when the page marks the end of the data
+        """
+        async with semaphore:
+            if window.is_past_end(cursor):
+                return None
+            data = await self._fetch_page(client, video_id, str(cursor))
 
-        # Prepare result
-        result = {
-            "video_url": video_url,
-            "video_id": video_id,
-            "total_comments": len(comments),
-            "comments": comments,
-            "pages_loaded": page_count,
-            "scraped_at": datetime.now().isoformat(),
-            "scraper_version": "2.0.0",
-            "success": len(comments) > 0,
-        }
+        if not data or not data.get("aweme_comments"):
+            window.close_at(cursor)
+            return None
 
-        # Save results
-        output_file = Path("output") / f"douyin_api_{video_id}_{int(time.time())}.json"
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+        parsed = self._parse_comments(data["aweme_comments"], video_id)
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        window.fetched += len(parsed)
+        if (
+            not data.get("has_more", True)
+            or not data.get("cursor")
+            or window.is_full()
+        ):
+            window.close_at(cursor)
 
-        self._print_summary(result, output_file)
+        return parsed
 
-        return result
+    async def _fetch_remaining_pages(
+        self,
+        client: httpx.AsyncClient,
+        video_id: str,
+        start_cursor: int,
+        max_comments: Optional[int],
+    ) -> int:
+        """Fetch pages after the first one concurrently.
+
+        Pages are scheduled up front and consumed in cursor order, so the
+        output keeps the API ordering. Workers share a ``_FetchWindow``: once
+        any page reports the end of the data, or enough comments have been
+        fetched, later pages are skipped before they are requested. When the
+        consumer stops, every outstanding task is cancelled and awaited
+        before returning, so no request outlives the call.
+
+        Returns:
+            Number of pages loaded
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        window = _FetchWindow(self.total_comments, max_comments)
+        tasks = [
+            asyncio.create_task(
+                self._fetch_comments_page(
+                    client,
+                    semaphore,
+                    window,
+                    video_id,
+                    start_cursor + i * self.page_size,
+                )
+            )
+            for i in range(self.max_pages - 1)
+        ]
+
+        pages_loaded = 0
+        try:
+            for task in tasks:
+                new_comments = await task
+                if new_comments is None:
+                    logger.debug("   ℹ️  已无更多评论")
+                    break
+
+                # A page whose comments were all filtered out still counts
+                self._store_comments(new_comments)
+                pages_loaded += 1
+                logger.debug(
+                    "   ✅ 获取 %d 条 (总计: %d)",
+                    len(new_comments),
+                    self.total_comments,
+                )
+
+                # Batched progress instead of per-page output; the first
+                # page was already loaded by scrape()
+                total_pages = pages_loaded + 1
+                if total_pages % 10 == 0:
+                    logger.info(
+                        "📥 已加载 %d 页 (总计: %d 条)",
+                        total_pages,
+                        self.total_comments,
+                    )
+
+                if max_comments and self.total_comments >= max_comments:
+                    print(f"✅ 已达到目标评论数: {max_comments}")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return pages_loaded
 
     async def _get_initial_cookies(self, client: httpx.AsyncClient, url: str):
         """Get initial cookies from the video page."""
@@ -184,29 +477,26 @@ class DouyinAPIScraper:
                 "Accept": "text/html,application/xhtml+xml",
             }
 
-            response = await client.get(url, headers=headers, follow_redirects=True)
+            # Cookies set by the page land in the client's jar and are sent
+            # automatically on every later request
+            await client.get(url, headers=headers, follow_redirects=True)
 
-            # Extract cookies - handle both CookieJar and list
-            if hasattr(response.cookies, 'items'):
-                for name, value in response.cookies.items():
-                    self.cookies[name] = value
-            else:
-                for cookie in response.cookies:
-                    self.cookies[cookie.name] = cookie.value if hasattr(cookie, 'value') else cookie
-
-            print(f"✅ 获取到 {len(self.cookies)} 个cookies")
+            print(f"✅ 获取到 {len(client.cookies)} 个cookies")
 
         except Exception as e:
             print(f"⚠️  获取cookies失败: {e}")
 
-    def _format_cookies(self) -> str:
-        """Format cookies for HTTP header."""
-        return "; ".join([f"{k}={v}" for k, v in self.cookies.items()])
-
     async def _try_alternative_api(
-        self, client: httpx.AsyncClient, video_id: str, max_comments: Optional[int]
-    ) -> dict:
-        """Try alternative API endpoints."""
+        self, client: httpx.AsyncClient, video_id: str
+    ) -> List[dict]:
+        """Try alternative API endpoints.
+
+        All endpoints are probed concurrently; the first one that returns
+        comments wins and the remaining probes are cancelled.
+
+        Returns:
+            Comments from the first endpoint that answered, or an empty list
+        """
         print("\n🔄 尝试备用API方法...")
 
         alternative_urls = [
@@ -214,113 +504,116 @@ class DouyinAPIScraper:
             "https://www.douyin.com/comment/v2/list/",
         ]
 
+        pending = {
+            asyncio.create_task(self._probe(client, api_url, video_id))
+            for api_url in alternative_urls
+        }
         comments = []
 
-        for api_url in alternative_urls:
-            try:
-                print(f"   🔍 尝试: {api_url.split('/')[-3]}")
+        try:
+            while pending and not comments:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.result():
+                        comments = task.result()
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-                params = {"aweme_id": video_id, "count": "20", "cursor": "0"}
+        if not comments:
+            print("   ❌ 所有备用API均失败")
 
-                headers = {
-                    "User-Agent": self.user_agent,
-                    "Referer": self.base_url,
-                    "Cookie": self._format_cookies(),
-                }
+        return comments
 
-                response = await client.get(api_url, params=params, headers=headers)
+    async def _probe(
+        self, client: httpx.AsyncClient, api_url: str, video_id: str
+    ) -> List[dict]:
+        """Fetch the first comment page from one alternative endpoint."""
+        try:
+            logger.debug("   🔍 尝试: %s", api_url.split("/")[-3])
 
-                if response.status_code == 200:
-                    data = response.json()
+            params = {"aweme_id": video_id, "count": "20", "cursor": "0"}
 
-                    # Try different response structures
-                    if "comments" in data:
-                        comments_list = data["comments"]
-                    elif "aweme_comments" in data:
-                        comments_list = data["aweme_comments"]
-                    elif "data" in data and "comments" in data["data"]:
-                        comments_list = data["data"]["comments"]
-                    else:
-                        continue
+            headers = {
+                "User-Agent": self.user_agent,
+                "Referer": self.base_url,
+            }
 
-                    if comments_list:
-                        parsed = self._parse_comments(comments_list, video_id)
-                        comments.extend(parsed)
-                        print(f"   ✅ 备用API成功! 获取 {len(parsed)} 条")
-                        break
+            response = await self._fetch_with_retry(client, api_url, params, headers)
 
-            except Exception as e:
-                print(f"   ❌ 失败: {e}")
-                continue
+            if response.status_code != 200:
+                return []
 
-        if comments:
-            return {
-                "video_id": video_id,
-                "total_comments": len(comments),
-                "comments": comments,
-                "scraped_at": datetime.now().isoformat(),
-                "success": True,
-            }
+            data = orjson.loads(response.content)
+
+            # Try different response structures
+            if "comments" in data:
+                comments_list = data["comments"]
+            elif "aweme_comments" in data:
+                comments_list = data["aweme_comments"]
+            elif "data" in data and "comments" in data["data"]:
+                comments_list = data["data"]["comments"]
+            else:
+                return []
+
+            parsed = self._parse_comments(comments_list or [], video_id)
+            if parsed:
+                logger.debug("   ✅ 备用API成功! 获取 %d 条", len(parsed))
+            return parsed
 
-        return {"success": False, "error": "All API attempts failed"}
+        except Exception as e:
+            logger.warning("   ❌ 失败: %s", e)
+            return []
 
     def _parse_comments(self, comments_list: List[dict], video_id: str) -> List[dict]:
         """Parse comment data from API response."""
         parsed = []
+        append = parsed.append
+
+        # All comments on a page share the same scrape time
+        timestamp = datetime.now().isoformat()
 
         for idx, comment_data in enumerate(comments_list):
             try:
-                # Try different field names
-                text = (
-                    comment_data.get("text")
-                    or comment_data.get("comment_text")
-                    or ""
-                )
+                get = comment_data.get
 
+                # Try different field names
+                text = get("text") or get("comment_text")
                 if not text:
                     continue
 
                 # Parse user info
-                user_data = comment_data.get("user", {})
-                username = (
-                    user_data.get("nickname")
-                    or user_data.get("unique_id")
-                    or user_data.get("uid", "")
-                )
+                user_data = get("user") or {}
+                user_get = user_data.get
+                uid = user_get("uid")
 
-                # Parse likes
-                likes = comment_data.get("digg_count", comment_data.get("like_count", 0))
-
-                parsed.append(
+                append(
                     {
-                        "comment_id": comment_data.get("cid", f"{video_id}_{idx}"),
+                        "comment_id": get("cid", f"{video_id}_{idx}"),
                         "video_id": video_id,
                         "text": text,
-                        "username": username,
-                        "likes": likes,
-                        "timestamp": datetime.now().isoformat(),
-                        "user_id": str(
-                            user_data.get("uid", user_data.get("id", ""))
+                        "username": (
+                            user_get("nickname") or user_get("unique_id") or uid or ""
                         ),
+                        "likes": get("digg_count", get("like_count", 0)),
+                        "timestamp": timestamp,
+                        "user_id": str(user_get("id", "") if uid is None else uid),
                     }
                 )
             except Exception as e:
-                print(f"   ⚠️  解析评论错误: {e}")
+                logger.warning("   ⚠️  解析评论错误: %s", e)
                 continue
 
         return parsed
 
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from URL."""
-        try:
-            if "modal_id=" in url:
-                return url.split("modal_id=")[-1].split("&")[0]
-            elif "/video/" in url:
-                return url.split("/video/")[-1].split("?")[0]
-            else:
-                return ""
-        except:
-            return ""
+        match = _VIDEO_ID_RE.search(url)
+        return match.group(1) if match else ""
 
     def _print_summary(self, result: dict, output_file: Path):
         """Print scraping summary."""
@@ -334,22 +627,21 @@ class DouyinAPIScraper:
         if "pages_loaded" in result:
             print(f"📄 加载页数: {result['pages_loaded']}")
 
-        if result["comments"]:
-            total_likes = sum(c.get("likes", 0) for c in result["comments"])
-            avg_likes = (
-                total_likes / len(result["comments"]) if result["comments"] else 0
-            )
+        if result["total_comments"]:
+            total_likes = result["total_likes"]
+            avg_likes = total_likes / result["total_comments"]
 
             print(f"👍 总点赞数: {total_likes}")
             print(f"📈 平均点赞: {avg_likes:.1f}")
 
             print(f"\n💬 前10条评论:")
-            for i, comment in enumerate(result["comments"][:10], 1):
+            for i, comment in enumerate(self.preview, 1):
                 print(f"   {i}. [{comment.get('likes', 0)} 赞] {comment.get('text', '')[:80]}")
                 if comment.get("username"):
                     print(f"      👤 {comment.get('username', 'unknown')}")
 
         print(f"\n💾 结果已保存: {output_file}")
+        print(f"💾 评论已保存: {result['comments_file']}")
         print("=" * 70)
 
 
@@ -359,6 +651,9 @@ async def main():
         print("用法: python3 douyin_api.py <抖音视频URL> [选项]")
         print("\n选项:")
         print("  --max N        最多爬取N条评论")
+        print("  --concurrency N  并发请求页数 (默认: 10)")
+        print("  --rps N        每秒最多请求数 (默认: 5)")
+        print("  --verbose      输出每个请求的调试日志")
         print("\n示例:")
         print("python3 douyin_api.py 'https://www.douyin.com/user/...?modal_id=7597795827700487787'")
         print("python3 douyin_api.py '<URL>' --max 100")
@@ -366,18 +661,38 @@ async def main():
 
     url = sys.argv[1]
 
+    # Per-request details are logged at DEBUG so the hot loop stays quiet
+    logging.basicConfig(
+        level=logging.DEBUG if "--verbose" in sys.argv else logging.INFO,
+        format="%(message)s",
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
     max_comments = None
+    concurrency = 10
+    requests_per_second = 5.0
     for i, arg in enumerate(sys.argv):
         if arg == "--max" and i + 1 < len(sys.argv):
             try:
                 max_comments = int(sys.argv[i + 1])
             except ValueError:
                 pass
-
-    scraper = DouyinAPIScraper()
+        elif arg == "--concurrency" and i + 1 < len(sys.argv):
+            try:
+                concurrency = int(sys.argv[i + 1])
+            except ValueError:
+                pass
+        elif arg == "--rps" and i + 1 < len(sys.argv):
+            try:
+                requests_per_second = float(sys.argv[i + 1])
+            except ValueError:
+                pass
 
     try:
-        result = await scraper.scrape(url, max_comments=max_comments)
+        async with DouyinAPIScraper(
+            concurrency=concurrency, requests_per_second=requests_per_second
+        ) as scraper:
+            result = await scraper.scrape(url, max_comments=max_comments)
 
         if result["success"]:
             print("\n✅ 爬取成功!")
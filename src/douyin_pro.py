@@ -1,20 +1,407 @@
 """Advanced Douyin comment scraper with robust extraction."""
 
 import asyncio
+import heapq
 import json
+import math
+import os
 import re
-import random
+import struct
 import sys
+import time
+from array import array
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from datetime import datetime
 from pathlib import Path
+from string import Template
 from typing import List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import orjson
+import xxhash
 from fake_useragent import UserAgent
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--start-maximized",
+]
+
+# Matches both ``?modal_id=<id>`` and ``/video/<id>`` URL forms
+_VIDEO_ID_RE = re.compile(r"(?:modal_id=|/video/)([^?&/]+)")
+
+# Minimum interval between flushes of buffered progress lines (seconds)
+LOG_FLUSH_INTERVAL = 0.5
+
+# Pooled contexts are recycled after this many scrapes
+MAX_USES_PER_CONTEXT = 20
+
+# Candidate comment container selectors, most specific first
+COMMENT_SELECTORS = [
+    'div[class*="comment-list"] > div',
+    'div[class*="CommentItem"]',
+    'div[class*="commentItem"]',
+    'div[class*="reply-item"]',
+    '[class*="CommentContainer"] > div',
+    'li[class*="comment"]',
+]
+COMMENT_CONTAINER_SEL = ", ".join(COMMENT_SELECTORS)
+
+# How long to wait for a scroll to load more comments (ms)
+SCROLL_LOAD_TIMEOUT = 3000
+
+# Anti-detection shims installed in every browser context
+_ANTI_DETECT_JS = """
+// Hide webdriver
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+
+// Mock Chrome object
+window.chrome = {
+    runtime: {},
+    loadTimes: function() {},
+    csi: function() {},
+    app: {}
+};
+
+// Mock permissions
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+// Mock plugins
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5]
+});
+
+// Mock languages
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['zh-CN', 'zh', 'en-US', 'en']
+});
+"""
+
+# Installed as an init script: a MutationObserver queues every comment
+# container added to the DOM so each scroll only has to look at new nodes
+_COMMENT_OBSERVER_JS = Template("""(() => {
+    const selector = $selector;
+    window.__newComments = [];
+    const observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                if (node.matches(selector)) {
+                    window.__newComments.push(node);
+                } else {
+                    window.__newComments.push(...node.querySelectorAll(selector));
+                }
+            }
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true});
+})();""").substitute(selector=json.dumps(COMMENT_CONTAINER_SEL))
+
+# Skip layout and paint for the video player, recommendations and sidebars.
+# Regions containing comments are left alone, so the comment list still
+# renders and lazy-loads as it scrolls into view
+_HIDE_NON_COMMENT_JS = """document.addEventListener('DOMContentLoaded', () => {
+    const keep = ':not([class*="comment"]):not(:has([class*="comment"]))';
+    const style = document.createElement('style');
+    const regions = ['video', '[class*="recommend"]', '[class*="sidebar"]', '[class*="player"]'];
+    style.textContent = regions.map((sel) => sel + keep).join(', ') +
+        ' { content-visibility: hidden !important; contain: strict; }';
+    document.head.appendChild(style);
+});"""
+
+# Everything injected into a new context, sent over CDP once per context
+_INIT_SCRIPT_JS = "\n".join(
+    [_ANTI_DETECT_JS, _COMMENT_OBSERVER_JS, _HIDE_NON_COMMENT_JS]
+)
+
+# Requests aborted at the network layer: the video stream, images and web
+# fonts are never needed to read comments, nor are telemetry beacons.
+# Stylesheets are kept so the comment list lays out normally
+BLOCKED_RESOURCE_TYPES = {"media", "image", "font"}
+_TRACKER_URL_RE = re.compile(
+    r"//(?:mcs|mon)\.zijieapi\.com/|google-analytics\.com|googletagmanager\.com"
+)
+
+# Drain the observer's queue, reading text, likes and username from each
+# queued container with scoped queries, then scroll to load the next batch;
+# one CDP round trip per scroll
+_SCROLL_AND_DRAIN_JS = """() => {
+    const containers = window.__newComments || [];
+    window.__newComments = [];
+
+    const results = [];
+    for (const container of containers) {
+        const textEl = container.querySelector('[class*="content"], [class*="text"]');
+        const text = (textEl || container).textContent?.trim();
+        if (!text || text.length < 2 || text.length > 1000) continue;
+
+        const likeEl = container.querySelector('[class*="like"], [class*="digg"]');
+        const likeMatch = likeEl?.textContent.match(/\\d+/);
+
+        const userEl = container.querySelector('[class*="user"], [class*="name"]');
+        const username = userEl?.textContent?.trim();
+
+        results.push({
+            text: text,
+            likes: likeMatch ? parseInt(likeMatch[0]) : 0,
+            username: username && username.length < 50 ? username : 'unknown'
+        });
+    }
+
+    window.scrollTo(0, document.body.scrollHeight - 500);
+    return results;
+}"""
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over comment texts, persistable to disk.
+
+    The number of distinct texts added is saved with the bits, so a filter
+    reloaded across runs knows when it has reached ``capacity``; past that
+    point its false-positive rate climbs quickly.
+    """
+
+    _MAGIC = b"BLM2"
+    # Bit count, hash count, capacity, item count, error rate
+    _HEADER = struct.Struct("<QIQQd")
+    # Files written before the item count was saved: bit count, hash count
+    _LEGACY_HEADER = struct.Struct("<QI")
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 1e-5):
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Expected number of distinct items
+            error_rate: Target false-positive rate at ``capacity`` items
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, text: str):
+        # Double hashing: both halves of one 128-bit digest seed k positions
+        digest = xxhash.xxh3_128_intdigest(text.encode())
+        h1, h2 = digest >> 64, digest & 0xFFFFFFFFFFFFFFFF
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, text: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(text))
+
+    def is_full(self) -> bool:
+        """Whether ``capacity`` distinct texts have been added."""
+        return self.count >= self.capacity
+
+    def add(self, text: str):
+        """Add a text to the filter."""
+        bits = self.bits
+        is_new = False
+        for pos in self._positions(text):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.count += 1
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """Load a filter saved with :meth:`save`."""
+        data = path.read_bytes()
+        bloom = cls.__new__(cls)
+        if data.startswith(cls._MAGIC):
+            offset = len(cls._MAGIC)
+            (
+                bloom.num_bits,
+                bloom.num_hashes,
+                bloom.capacity,
+                bloom.count,
+                bloom.error_rate,
+            ) = cls._HEADER.unpack_from(data, offset)
+            offset += cls._HEADER.size
+        else:
+            bloom.num_bits, bloom.num_hashes = cls._LEGACY_HEADER.unpack_from(data)
+            bloom.capacity = max(
+                1, round(bloom.num_bits * math.log(2) / bloom.num_hashes)
+            )
+            bloom.error_rate = 0.5**bloom.num_hashes
+            offset = cls._LEGACY_HEADER.size
+        bloom.bits = bytearray(data[offset:])
+        if offset == cls._LEGACY_HEADER.size:
+            bloom.count = bloom._estimate_count()
+        return bloom
+
+    def _estimate_count(self) -> int:
+        """Estimate the item count from the share of bits set."""
+        set_bits = sum(bin(byte).count("1") for byte in self.bits)
+        if set_bits >= self.num_bits:
+            return self.capacity
+        m, k = self.num_bits, self.num_hashes
+        return round(-m / k * math.log(1 - set_bits / m))
+
+    def save(self, path: Path):
+        """Write the filter to ``path`` atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        header = self._MAGIC + self._HEADER.pack(
+            self.num_bits, self.num_hashes, self.capacity, self.count, self.error_rate
+        )
+        tmp_path.write_bytes(header + self.bits)
+        os.replace(tmp_path, path)
+
+
+class BrowserPool:
+    """One Chromium process handing out pre-configured browser contexts.
+
+    Contexts are created up front with the anti-detection scripts already
+    installed, so a scrape only opens a page. Each context is replaced after
+    ``MAX_USES_PER_CONTEXT`` checkouts to keep its memory from growing.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        headless: bool = False,
+        proxy_url: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ):
+        """Initialize browser pool.
+
+        Args:
+            size: Number of browser contexts to keep ready
+            headless: Run browser in headless mode
+            proxy_url: Optional proxy URL
+            user_agent: User agent for every context (random if omitted)
+        """
+        self.size = size
+        self.headless = headless
+        self.proxy_url = proxy_url
+        self.user_agent = user_agent or UserAgent().random
+        self._stack: Optional[AsyncExitStack] = None
+        self._browser = None
+        self._contexts: asyncio.Queue = asyncio.Queue()
+        self._uses = {}
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Launch Chromium and pre-create the pooled contexts."""
+        launch_options = {
+            "headless": self.headless,
+            "args": BROWSER_ARGS,
+        }
+
+        if self.proxy_url:
+            launch_options["proxy"] = {"server": self.proxy_url}
+
+        # slow_mo delays every Playwright call; only useful when watching a run
+        if os.getenv("DOUYIN_DEBUG"):
+            launch_options["slow_mo"] = 50
+
+        # Playwright and the browser are closed in reverse order by close()
+        self._stack = AsyncExitStack()
+        playwright = await self._stack.enter_async_context(async_playwright())
+        self._browser = await self._stack.enter_async_context(
+            await playwright.chromium.launch(**launch_options)
+        )
+
+        for _ in range(self.size):
+            self._contexts.put_nowait(await self._new_context())
+
+    async def close(self):
+        """Close the browser and stop Playwright."""
+        if self._stack:
+            stack, self._stack = self._stack, None
+            self._browser = None
+            await stack.aclose()
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Check out a context for the duration of the ``async with`` block.
+
+        A recycled context's slot is refilled on the next checkout, so if
+        creating the replacement fails, that caller sees the error and the
+        pool keeps its size.
+        """
+        context = await self._contexts.get()
+        if context is None:
+            try:
+                context = await self._new_context()
+            except BaseException:
+                self._contexts.put_nowait(None)
+                raise
+
+        try:
+            yield context
+        finally:
+            self._uses[context] += 1
+            if self._uses[context] >= MAX_USES_PER_CONTEXT:
+                del self._uses[context]
+                self._contexts.put_nowait(None)
+                # The slot is already back; a failed close must not mask
+                # an error raised inside the block
+                with suppress(Exception):
+                    await context.close()
+            else:
+                self._contexts.put_nowait(context)
+
+    @staticmethod
+    async def _filter_route(route):
+        """Abort media, images, fonts and trackers; let everything else through."""
+        request = route.request
+        if (
+            request.resource_type in BLOCKED_RESOURCE_TYPES
+            or _TRACKER_URL_RE.search(request.url)
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_context(self):
+        # Create context with realistic settings
+        context = await self._browser.new_context(
+            user_agent=self.user_agent,
+            viewport={"width": 1920, "height": 1080},
+            locale="zh-CN",
+            timezone_id="Asia/Shanghai",
+            permissions=["geolocation"],
+            geolocation={"latitude": 39.9042, "longitude": 116.4074},  # Beijing
+            color_scheme="light",
+            device_scale_factor=1,
+        )
+
+        # Anti-detection shims, the comment observer and the CSS overrides,
+        # in one script
+        await context.add_init_script(_INIT_SCRIPT_JS)
+        await context.route("**/*", self._filter_route)
+
+        self._uses[context] = 0
+        return context
+
 
 class DouyinScraperPro:
     """Professional Douyin comment scraper with advanced features."""
@@ -24,6 +411,9 @@ class DouyinScraperPro:
         proxy_url: Optional[str] = None,
         headless: bool = False,
         timeout: int = 60,
+        seen_file: Optional[Path] = None,
+        pool: Optional["BrowserPool"] = None,
+        seen_capacity: int = 100_000,
     ):
         """Initialize advanced scraper.
 
@@ -31,13 +421,73 @@ class DouyinScraperPro:
             proxy_url: Optional proxy URL
             headless: Run browser in headless mode
             timeout: Page load timeout in seconds
+            seen_file: Optional Bloom filter file; comments recorded there by
+                earlier runs are skipped, and new ones are added on exit
+            pool: Optional shared browser pool. When omitted, a private
+                single-context pool is started on ``async with``, or per
+                scrape if the scraper is not used as a context manager
+            seen_capacity: Distinct comments the Bloom filter holds before it
+                is replaced by an empty one
         """
         self.proxy_url = proxy_url
         self.headless = headless
         self.timeout = timeout * 1000  # Convert to ms
-        self.user_agent = UserAgent().random
-        self.comments = []
-        self.seen_hashes = set()  # Track seen comments to avoid duplicates
+        self.pool = pool
+        self.user_agent = pool.user_agent if pool else UserAgent().random
+        self._reset_comments()
+
+        # Per-scroll progress lines, printed in batches by _log()
+        self._log_buf: List[str] = []
+        self._log_flushed_at = time.monotonic()
+        self.seen_file = seen_file
+        self.seen_capacity = seen_capacity
+
+        # Track seen comments to avoid duplicates, across runs if persisted
+        self.seen = self._load_seen()
+
+        self._exit_stack: Optional[AsyncExitStack] = None
+
+    async def __aenter__(self) -> "DouyinScraperPro":
+        """Start a private browser pool that stays open for every scrape."""
+        if self.pool is None:
+            self._exit_stack = AsyncExitStack()
+            print("\n🚀 启动浏览器...")
+            self.pool = await self._exit_stack.enter_async_context(
+                self._private_pool()
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._exit_stack:
+            stack, self._exit_stack = self._exit_stack, None
+            self.pool = None
+            await stack.aclose()
+
+    def _reset_comments(self):
+        """Start empty comment columns for a new scrape."""
+        # Comment fields kept as parallel columns; see _comment_records()
+        self.texts: List[str] = []
+        self.likes = array("q")
+        self.usernames: List[str] = []
+        self.timestamps: List[str] = []
+
+    def _load_seen(self) -> BloomFilter:
+        """Load the persisted filter, or start a new one if missing or full."""
+        if self.seen_file and self.seen_file.exists():
+            seen = BloomFilter.load(self.seen_file)
+            if not seen.is_full():
+                return seen
+            print(f"⚠️  去重文件已满 ({seen.count} 条)，重新开始: {self.seen_file}")
+        return BloomFilter(capacity=self.seen_capacity)
+
+    def _private_pool(self) -> BrowserPool:
+        """Build a single-context pool configured from this scraper."""
+        return BrowserPool(
+            size=1,
+            headless=self.headless,
+            proxy_url=self.proxy_url,
+            user_agent=self.user_agent,
+        )
 
     async def scrape(self, video_url: str, max_comments: Optional[int] = None) -> dict:
         """Scrape Douyin comments with full pipeline.
@@ -49,174 +499,162 @@ class DouyinScraperPro:
         Returns:
             Dictionary with scraping results
         """
+        video_id = self._extract_video_id(video_url)
+
+        # An entered scraper is reused across videos; results are per video.
+        # Only a persisted filter carries dedup state from one scrape to the next
+        self._reset_comments()
+        if not self.seen_file:
+            self.seen = BloomFilter(capacity=self.seen_capacity)
+
         print("=" * 70)
         print("🔍 抖音高级评论爬虫")
         print("=" * 70)
         print(f"\n📍 目标URL: {video_url}")
-        print(f"🎥 视频ID: {self._extract_video_id(video_url)}")
+        print(f"🎥 视频ID: {video_id}")
         print(f"🌐 用户代理: {self.user_agent[:50]}...")
         print(f"🖥️  无头模式: {'是' if self.headless else '否'}")
 
-        try:
-            async with async_playwright() as p:
-                # Launch browser with advanced options
-                browser_args = [
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-web-security",
-                    "--disable-features=VizDisplayCompositor",
-                    "--start-maximized",
-                ]
-
-                launch_options = {
-                    "headless": self.headless,
-                    "args": browser_args,
-                    "slow_mo": 50,  # Slow down operations
-                }
-
-                if self.proxy_url:
-                    launch_options["proxy"] = {"server": self.proxy_url}
+        # Owns the private pool when this scrape has to start its own
+        stack = AsyncExitStack()
 
+        try:
+            pool = self.pool
+            if pool is None:
                 print("\n🚀 启动浏览器...")
-                browser = await p.chromium.launch(**launch_options)
-
-                # Create context with realistic settings
-                context = await browser.new_context(
-                    user_agent=self.user_agent,
-                    viewport={"width": 1920, "height": 1080},
-                    locale="zh-CN",
-                    timezone_id="Asia/Shanghai",
-                    permissions=["geolocation"],
-                    geolocation={"latitude": 39.9042, "longitude": 116.4074},  # Beijing
-                    color_scheme="light",
-                    device_scale_factor=1,
-                )
-
-                # Inject anti-detection scripts
-                await context.add_init_script("""
-                    // Hide webdriver
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-
-                    // Mock Chrome object
-                    window.chrome = {
-                        runtime: {},
-                        loadTimes: function() {},
-                        csi: function() {},
-                        app: {}
-                    };
-
-                    // Mock permissions
-                    const originalQuery = window.navigator.permissions.query;
-                    window.navigator.permissions.query = (parameters) => (
-                        parameters.name === 'notifications' ?
-                            Promise.resolve({ state: Notification.permission }) :
-                            originalQuery(parameters)
-                    );
-
-                    // Mock plugins
-                    Object.defineProperty(navigator, 'plugins', {
-                        get: () => [1, 2, 3, 4, 5]
-                    });
-
-                    // Mock languages
-                    Object.defineProperty(navigator, 'languages', {
-                        get: () => ['zh-CN', 'zh', 'en-US', 'en']
-                    });
-                """)
+                pool = await stack.enter_async_context(self._private_pool())
 
+            async with pool.acquire() as context:
                 page = await context.new_page()
 
-                # Set up console logging
-                page.on("console", lambda msg: print(f"🔧 [浏览器] {msg.text}"))
-
-                print("📄 正在加载页面...")
                 try:
-                    await page.goto(video_url, timeout=self.timeout, wait_until="networkidle")
-                except Exception as e:
-                    print(f"⚠️  页面加载超时，继续尝试...")
-                    await page.wait_for_timeout(5000)
-
-                # Wait for page to stabilize
-                await page.wait_for_timeout(random.randint(3000, 5000))
-
-                # Check if we need to handle any popups or verifications
-                await self._handle_page_elements(page)
-
-                # Scroll to find and load comments
-                print("\n🔄 开始滚动和加载评论...")
-                scroll_attempts = 0
-                max_scrolls = 100
-                consecutive_empty = 0
-
-                while scroll_attempts < max_scrolls:
-                    if max_comments and len(self.comments) >= max_comments:
-                        print(f"\n✅ 已达到目标评论数: {max_comments}")
-                        break
-
-                    # Extract comments from current view
-                    new_comments = await self._extract_comments_advanced(page)
-                    if new_comments:
-                        old_count = len(self.comments)
-                        self.comments.extend(new_comments)
-                        new_count = len(self.comments)
-                        consecutive_empty = 0
-                        print(f"📝 第{scroll_attempts + 1}次滚动: +{new_count - old_count} 条 (总计: {new_count})")
-                    else:
-                        consecutive_empty += 1
-                        print(f"⏸️  第{scroll_attempts + 1}次滚动: 无新评论")
-
-                        if consecutive_empty >= 5:
-                            print("\nℹ️  连续多次无新评论，可能已到底部")
+                    # Set up console logging
+                    page.on("console", self._on_console)
+
+                    print("📄 正在加载页面...")
+                    try:
+                        await page.goto(
+                            video_url,
+                            timeout=self.timeout,
+                            wait_until="domcontentloaded",
+                        )
+                        # Ready as soon as the first comment container renders
+                        await page.wait_for_selector(
+                            COMMENT_CONTAINER_SEL, timeout=self.timeout
+                        )
+                    except Exception as e:
+                        print(f"⚠️  页面加载超时，继续尝试...")
+
+                    # Check if we need to handle any popups or verifications
+                    await self._handle_page_elements(page)
+
+                    # Scroll to find and load comments
+                    print("\n🔄 开始滚动和加载评论...")
+                    scroll_attempts = 0
+                    max_scrolls = 100
+                    consecutive_empty = 0
+
+                    while scroll_attempts < max_scrolls:
+                        if max_comments and len(self.texts) >= max_comments:
+                            self._flush_log()
+                            print(f"\n✅ 已达到目标评论数: {max_comments}")
                             break
 
-                    # Scroll down
-                    await self._smart_scroll(page)
-                    await page.wait_for_timeout(random.randint(1500, 2500))
-
-                    scroll_attempts += 1
-
-                await browser.close()
-
-                # Prepare results
-                video_id = self._extract_video_id(video_url)
-
-                result = {
-                    "video_url": video_url,
-                    "video_id": video_id,
-                    "total_comments": len(self.comments),
-                    "comments": self.comments,
-                    "scraped_at": datetime.now().isoformat(),
-                    "scraper_version": "1.0.0",
-                    "success": len(self.comments) > 0,
-                }
-
-                # Save results
-                output_file = Path("output") / f"douyin_{video_id}_{int(datetime.now().timestamp())}.json"
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(output_file, "w", encoding="utf-8") as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-
-                # Display summary
-                self._print_summary(result, output_file)
-
-                return result
+                        # Collect queued comments and scroll for more
+                        added = await self._scroll_and_extract(page)
+                        if added:
+                            consecutive_empty = 0
+                            self._log(f"📝 第{scroll_attempts + 1}次滚动: +{added} 条 (总计: {len(self.texts)})")
+                        else:
+                            consecutive_empty += 1
+                            self._log(f"⏸️  第{scroll_attempts + 1}次滚动: 无新评论")
+
+                            if consecutive_empty >= 5:
+                                self._flush_log()
+                                print("\nℹ️  连续多次无新评论，可能已到底部")
+                                break
+
+                        # Wait until the observer has queued new comments
+                        # instead of sleeping blindly
+                        try:
+                            await page.wait_for_function(
+                                "() => window.__newComments.length > 0",
+                                timeout=SCROLL_LOAD_TIMEOUT,
+                            )
+                        except PlaywrightTimeoutError:
+                            pass
+
+                        scroll_attempts += 1
+                finally:
+                    self._flush_log()
+                    await page.close()
+
+            # Prepare results
+            result = {
+                "video_url": video_url,
+                "video_id": video_id,
+                "total_comments": len(self.texts),
+                "comments": self._comment_records(),
+                "scraped_at": datetime.now().isoformat(),
+                "scraper_version": "1.0.0",
+                "success": len(self.texts) > 0,
+            }
+
+            # Save results
+            output_file = Path("output") / f"douyin_{video_id}_{int(datetime.now().timestamp())}.json"
+
+            # Serialize and write off the event loop so concurrent scrapes
+            # sharing a pool are not stalled by disk I/O
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_json, output_file, result)
+
+            # Display summary
+            self._print_summary(result, output_file)
+
+            return result
 
         except Exception as e:
             print(f"\n❌ 爬取失败: {e}")
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            await stack.aclose()
+            if self.seen_file:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.seen.save, self.seen_file)
+
+    @staticmethod
+    def _on_console(msg):
+        """Echo browser console errors and warnings; routine logging is noise."""
+        if msg.type in ("error", "warning"):
+            print(f"🔧 [浏览器] {msg.text}")
+
+    def _log(self, message: str):
+        """Buffer a progress line, printing the buffer at most every 0.5s."""
+        self._log_buf.append(message)
+        if time.monotonic() - self._log_flushed_at >= LOG_FLUSH_INTERVAL:
+            self._flush_log()
+
+    def _flush_log(self):
+        """Print all buffered progress lines in one write."""
+        if self._log_buf:
+            print("\n".join(self._log_buf))
+            self._log_buf.clear()
+        self._log_flushed_at = time.monotonic()
+
+    @staticmethod
+    def _write_json(output_file: Path, data: dict):
+        """Create the output directory and write ``data`` as indented JSON."""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     async def _handle_page_elements(self, page):
         """Handle any popups, cookies, or verification elements."""
         print("🔎 检查页面元素...")
 
-        # Try to find and click on any cookie consent
+        # Try to find and click on any cookie consent, probing every
+        # candidate selector in one query
         cookie_selectors = [
             'button[class*="cookie"]',
             'button[class*="accept"]',
@@ -224,110 +662,29 @@ class DouyinScraperPro:
             '[role="dialog"] button',
         ]
 
-        for selector in cookie_selectors:
-            try:
-                elements = await page.locator(selector).all()
-                if elements:
-                    print(f"✓ 找到cookie按钮，尝试点击: {selector}")
-                    for element in elements[:1]:
-                        await element.click()
-                        await page.wait_for_timeout(1000)
-                    break
-            except:
-                continue
-
-    async def _smart_scroll(self, page):
-        """Perform smart scrolling to load content."""
         try:
-            # Get current scroll position
-            scroll_height = await page.evaluate("document.body.scrollHeight")
+            button = page.locator(", ".join(cookie_selectors)).first
+            if await button.count():
+                print("✓ 找到cookie按钮，尝试点击")
+                # click() already waits for the button to be actionable
+                await button.click()
+        except Exception:
+            pass
 
-            # Scroll to near bottom
-            await page.evaluate(f"window.scrollTo(0, {scroll_height - 500})")
+    async def _scroll_and_extract(self, page) -> int:
+        """Extract comments added since the previous call, then scroll.
 
-            # Wait for new content
-            await page.wait_for_timeout(500)
-
-        except Exception as e:
-            print(f"⚠️  滚动错误: {e}")
-            try:
-                # Fallback: use keyboard
-                await page.keyboard.press("End")
-                await page.wait_for_timeout(1000)
-            except:
-                pass
+        The seen-hash check stays as a safety net for containers that are
+        re-inserted into the DOM.
 
-    async def _extract_comments_advanced(self, page) -> List[dict]:
-        """Advanced comment extraction with multiple strategies."""
-        new_comments = []
+        Returns:
+            Number of new comments appended
+        """
+        added = 0
 
         try:
-            # Strategy 1: Try to find comment containers
-            comment_selectors = [
-                'div[class*="comment-list"] > div',
-                'div[class*="CommentItem"]',
-                'div[class*="commentItem"]',
-                'div[class*="reply-item"]',
-                '[class*="CommentContainer"] > div',
-                'li[class*="comment"]',
-            ]
-
-            all_text_content = await page.evaluate("""() => {
-                const results = [];
-
-                // Find all text elements that might be comments
-                const allElements = document.querySelectorAll('*');
-
-                for (let el of allElements) {
-                    // Check if element contains text
-                    const text = el.textContent?.trim();
-                    if (!text || text.length < 2 || text.length > 1000) continue;
-
-                    // Check if it looks like a comment text
-                    const parent = el.parentElement;
-                    if (!parent) continue;
-
-                    // Check for common comment indicators
-                    const hasLikeButton = parent.querySelector('[class*="like"], [class*="digg"], [class*="thumb"]');
-                    const hasReplyButton = parent.querySelector('[class*="reply"], [class*="comment"]');
-                    const isInCommentSection = parent.closest('[class*="comment"], [class*="Comment"]');
-
-                    if (hasLikeButton || hasReplyButton || isInCommentSection) {
-                        // Get parent element
-                        const commentContainer = el.closest('[class*="comment"], [class*="Comment"], [class*="item"]');
-
-                        if (commentContainer) {
-                            // Try to extract likes
-                            let likes = 0;
-                            const likeElements = commentContainer.querySelectorAll('[class*="like"], [class*="digg"], [class*="count"]');
-                            likeElements.forEach(likeEl => {
-                                const likeText = likeEl.textContent || '';
-                                const match = likeText.match(/\\d+/);
-                                if (match) likes = Math.max(likes, parseInt(match[0]));
-                            });
-
-                            // Try to extract user info
-                            let username = 'unknown';
-                            const userElements = commentContainer.querySelectorAll('[class*="user"], [class*="name"], [class*="author"]');
-                            userElements.forEach(userEl => {
-                                const userText = userEl.textContent?.trim();
-                                if (userText && userText.length > 0 && userText.length < 50) {
-                                    username = userText;
-                                }
-                            });
-
-                            results.push({
-                                text: text,
-                                likes: likes,
-                                username: username,
-                                html: commentContainer.outerHTML.substring(0, 500)
-                            });
-                        }
-                    }
-                }
-
-                return results;
-            }""")
+            all_text_content = await page.evaluate(_SCROLL_AND_DRAIN_JS)
+            timestamp = datetime.now().isoformat()
 
             # Process results and deduplicate
             for comment_data in all_text_content:
@@ -336,37 +693,44 @@ class DouyinScraperPro:
                 if not text or len(text) < 2:
                     continue
 
-                # Create hash to avoid duplicates
-                text_hash = hash(text)
-
-                if text_hash in self.seen_hashes:
+                if text in self.seen:
                     continue
 
-                self.seen_hashes.add(text_hash)
+                # Past capacity, new comments would be dropped as false positives
+                if self.seen.is_full():
+                    print(f"\n⚠️  去重过滤器已满 ({self.seen.count} 条)，重新开始")
+                    self.seen = BloomFilter(capacity=self.seen_capacity)
+                self.seen.add(text)
 
-                new_comments.append({
-                    "text": text,
-                    "likes": comment_data.get("likes", 0),
-                    "username": comment_data.get("username", "anonymous"),
-                    "timestamp": datetime.now().isoformat(),
-                })
+                self.texts.append(text)
+                self.likes.append(comment_data.get("likes", 0))
+                self.usernames.append(comment_data.get("username", "anonymous"))
+                self.timestamps.append(timestamp)
+                added += 1
 
         except Exception as e:
             print(f"⚠️  提取评论失败: {e}")
+            try:
+                # Fallback: use keyboard to keep scrolling
+                await page.keyboard.press("End")
+            except Exception:
+                pass
 
-        return new_comments
+        return added
+
+    def _comment_records(self) -> List[dict]:
+        """Materialize the comment columns as one dict per comment."""
+        return [
+            {"text": text, "likes": likes, "username": username, "timestamp": ts}
+            for text, likes, username, ts in zip(
+                self.texts, self.likes, self.usernames, self.timestamps
+            )
+        ]
 
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from Douyin URL."""
-        try:
-            if "modal_id=" in url:
-                return url.split("modal_id=")[-1].split("&")[0]
-            elif "/video/" in url:
-                return url.split("/video/")[-1].split("?")[0]
-            else:
-                return "unknown"
-        except:
-            return "unknown"
+        match = _VIDEO_ID_RE.search(url)
+        return match.group(1) if match else "unknown"
 
     def _print_summary(self, result: dict, output_file: Path):
         """Print summary of scraping results."""
@@ -378,23 +742,23 @@ class DouyinScraperPro:
         print(f"📝 评论数量: {result['total_comments']}")
         print(f"🎥 视频 ID: {result['video_id']}")
 
-        if result['comments']:
-            total_likes = sum(c.get('likes', 0) for c in result['comments'])
-            avg_likes = total_likes / len(result['comments']) if result['comments'] else 0
+        if self.texts:
+            total_likes = sum(self.likes)
+            avg_likes = total_likes / len(self.likes)
 
             print(f"👍 总点赞数: {total_likes}")
             print(f"📈 平均点赞: {avg_likes:.1f}")
 
             # Show top 5 comments by likes
-            top_comments = sorted(
-                result['comments'], key=lambda x: x.get('likes', 0), reverse=True
-            )[:5]
+            top_idx = heapq.nlargest(
+                5, range(len(self.likes)), key=self.likes.__getitem__
+            )
 
             print(f"\n💬 热门评论 (Top 5):")
-            for i, comment in enumerate(top_comments, 1):
-                print(f"   {i}. [{comment.get('likes', 0)} 赞] {comment.get('text', '')[:80]}")
-                if comment.get('username'):
-                    print(f"      👤 {comment.get('username', 'anonymous')}")
+            for i, idx in enumerate(top_idx, 1):
+                print(f"   {i}. [{self.likes[idx]} 赞] {self.texts[idx][:80]}")
+                if self.usernames[idx]:
+                    print(f"      👤 {self.usernames[idx]}")
 
         print(f"\n💾 结果已保存到: {output_file}")
         print("=" * 70)
@@ -418,6 +782,10 @@ async def main():
         print("  --headless     无头模式运行（默认：显示浏览器窗口）")
         print("  --max N        最多爬取N条评论")
         print("  --proxy URL     使用代理")
+        print("  --seen-file F  跨会话去重文件（跳过之前已爬取的评论）")
+        print("  --seen-capacity N  去重文件容量，超出后重新开始 (默认: 100000)")
+        print("\n环境变量:")
+        print("  DOUYIN_DEBUG=1 放慢每个浏览器操作，便于观察调试")
         print("\n示例:")
         print("python3 douyin_pro.py 'https://www.douyin.com/user/...?modal_id=7597795827700487787'")
         print("python3 douyin_pro.py '<URL>' --max 50 --headless")
@@ -428,6 +796,8 @@ async def main():
     # Parse options
     headless = "--headless" in sys.argv
     max_comments = None
+    seen_file = None
+    seen_capacity = 100_000
 
     for i, arg in enumerate(sys.argv):
         if arg == "--max" and i + 1 < len(sys.argv):
@@ -435,13 +805,20 @@ async def main():
                 max_comments = int(sys.argv[i + 1])
             except ValueError:
                 pass
-
-    # Create scraper
-    scraper = DouyinScraperPro(headless=headless)
+        elif arg == "--seen-file" and i + 1 < len(sys.argv):
+            seen_file = Path(sys.argv[i + 1])
+        elif arg == "--seen-capacity" and i + 1 < len(sys.argv):
+            try:
+                seen_capacity = int(sys.argv[i + 1])
+            except ValueError:
+                pass
 
     # Run scraping
     try:
-        result = await scraper.scrape(url, max_comments=max_comments)
+        async with DouyinScraperPro(
+            headless=headless, seen_file=seen_file, seen_capacity=seen_capacity
+        ) as scraper:
+            result = await scraper.scrape(url, max_comments=max_comments)
 
         if result['success']:
             print("\n✅ 爬取成功完成！")
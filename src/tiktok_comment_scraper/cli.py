@@ -2,12 +2,11 @@
 
 import argparse
 import asyncio
-import json
 import os
 from pathlib import Path
 from typing import List
 
-from tiktok_comment_scraper.config.settings import settings
+from tiktok_comment_scraper.config.settings import get_settings
 from tiktok_comment_scraper.llm.client import LLMClient
 from tiktok_comment_scraper.models.comment import VideoSummary
 from tiktok_comment_scraper.scraper.tiktok import TikTokAPIScraper, TikTokScraper
@@ -30,14 +29,15 @@ async def scrape_and_analyze(
     Returns:
         VideoSummary with scraped and analyzed data
     """
+    settings = get_settings()
     output_dir = output_dir or settings.OUTPUT_DIR
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     print(f"Scraping comments from: {video_url}")
 
     if use_api:
-        scraper = TikTokAPIScraper()
-        comments = await scraper.scrape_video_comments(video_url, max_comments)
+        async with TikTokAPIScraper() as scraper:
+            comments = await scraper.scrape_video_comments(video_url, max_comments)
     else:
         async with TikTokScraper(headless=True) as scraper:
             comments = await scraper.scrape_video_comments(video_url, max_comments)
@@ -51,8 +51,8 @@ async def scrape_and_analyze(
 
     llm_client = LLMClient()
 
-    analysis_results = llm_client.batch_analyze(comments)
-    summary.analysis_results = analysis_results
+    analysis_results = await llm_client.batch_analyze_async(comments)
+    summary.analysis_results = llm_client.to_analysis_results(analysis_results)
 
     print("Generating summary...")
 
@@ -65,7 +65,7 @@ async def scrape_and_analyze(
 
     output_file = Path(output_dir) / f"{video_id}_summary.json"
     with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(summary.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+        f.write(summary.model_dump_json(indent=2))
 
     print(f"Results saved to: {output_file}")
 
@@ -74,6 +74,7 @@ async def scrape_and_analyze(
 
 def main():
     """CLI entry point."""
+    settings = get_settings()
     parser = argparse.ArgumentParser(
         description="TikTok/Douyin Comment Scraper with AI Analysis"
     )
@@ -1,6 +1,8 @@
 """Application configuration using pydantic-settings."""
 
+from functools import lru_cache
 from typing import List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +14,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        env_prefix="",
     )
 
     ZAI_API_KEY: str
@@ -32,10 +35,24 @@ class Settings(BaseSettings):
 
     OUTPUT_DIR: str = "output"
     BATCH_SIZE: int = 50
+    # Output token limit for one batched sentiment request
+    LLM_MAX_OUTPUT_TOKENS: int = 4096
+    LLM_CONCURRENCY: int = 16
+    LLM_CACHE_DIR: Optional[str] = None
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance, creating it on first use.
 
-    class Config:
-        """Pydantic config."""
-        env_prefix = ""
+    Deferring creation means importing the package does not require
+    ZAI_API_KEY to be set yet.
+    """
+    return Settings()
 
 
-settings = Settings()
+def __getattr__(name: str):
+    # Keep ``from ... import settings`` working without eager validation
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,54 @@
+"""Persistent cache for LLM results."""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+
+class ResultCache:
+    """SQLite-backed key/value store for JSON-serializable LLM results.
+
+    Safe to share between the worker threads used for concurrent analysis.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+        """
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path / "llm_cache.sqlite3"), check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any):
+        """Store ``value`` under ``key``, replacing any previous entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False)),
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
@@ -1,8 +1,12 @@
 """LLM client wrapper with fallback support."""
 
-import json
-from typing import List, Optional
+import asyncio
+import re
+from typing import Any, Dict, List, Optional
 
+import orjson
+import xxhash
+from pydantic import TypeAdapter, ValidationError
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -10,8 +14,9 @@ from tenacity import (
     wait_exponential,
 )
 
-from tiktok_comment_scraper.config.settings import settings
-from tiktok_comment_scraper.models.comment import Comment, Sentiment
+from tiktok_comment_scraper.config.settings import get_settings
+from tiktok_comment_scraper.llm.cache import ResultCache
+from tiktok_comment_scraper.models.comment import AnalysisResult, Comment, Sentiment
 
 try:
     from zai import ZaiClient
@@ -22,6 +27,45 @@ except ImportError:
     APIStatusError = Exception
     APITimeoutError = Exception
 
+# JSON value inside a markdown code fence
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
+# Outermost JSON object / array in a response, fenced in markdown or bare
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+_ANALYSIS_RESULTS_ADAPTER = TypeAdapter(List[AnalysisResult])
+
+# Output tokens budgeted per comment in a batched request
+_TOKENS_PER_BATCH_RESULT = 300
+
+
+def _balanced_json_prefix(text: str) -> Optional[str]:
+    """Return the bracket-balanced JSON value that ``text`` starts with.
+
+    Used when the outermost-bracket regex over-matches, e.g. when prose
+    after the JSON value contains another closing brace.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[: i + 1]
+    return None
+
 
 class LLMClient:
     """Client for interacting with Z.ai LLM with fallback support."""
@@ -38,6 +82,7 @@ class LLMClient:
                 "zai-sdk is not installed. Install with: pip install zai-sdk"
             )
 
+        settings = get_settings()
         self.api_key = api_key or settings.ZAI_API_KEY
         self.base_url = base_url or settings.ZAI_BASE_URL
         self.timeout = settings.ZAI_TIMEOUT
@@ -51,6 +96,14 @@ class LLMClient:
             max_retries=self.max_retries,
         )
 
+        # Results keyed by model + comment text, shared across runs
+        self.cache = (
+            ResultCache(settings.LLM_CACHE_DIR) if settings.LLM_CACHE_DIR else None
+        )
+        # In-process layer in front of it, always on: duplicate comments
+        # within one run are answered without an LLM call
+        self._memo: Dict[str, Any] = {}
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -65,6 +118,11 @@ class LLMClient:
         Returns:
             Dictionary with sentiment, confidence, and key points
         """
+        cache_key = self._cache_key(self._normalize_text(comment.text))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._normalize_sentiment(cached)
+
         prompt = self._build_sentiment_prompt(comment)
 
         try:
@@ -82,7 +140,10 @@ class LLMClient:
             )
 
             result_text = response.choices[0].message.content
-            return self._parse_sentiment_response(result_text)
+            result = self._parse_sentiment_response(result_text)
+            if "error" not in result:
+                self._cache_set(cache_key, result)
+            return result
 
         except (APIStatusError, APIConnectionError) as e:
             raise RuntimeError(f"LLM API error: {e}")
@@ -96,6 +157,14 @@ class LLMClient:
         Returns:
             Summary text
         """
+        cache_key = self._cache_key(
+            "\n".join(sorted(f"{c.text}\0{c.like_count}" for c in comments)),
+            prefix="summary",
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         comment_texts = "\n".join(
             [f"- {c.text} ({c.like_count} likes)" for c in comments]
         )
@@ -121,43 +190,221 @@ Provide a 2-3 paragraph summary in Chinese."""
                 max_tokens=1000,
             )
 
-            return response.choices[0].message.content
+            summary = response.choices[0].message.content
+            self._cache_set(cache_key, summary)
+            return summary
 
         except (APIStatusError, APIConnectionError) as e:
             raise RuntimeError(f"LLM API error: {e}")
 
-    def batch_analyze(
-        self, comments: List[Comment], batch_size: Optional[int] = None
+    async def analyze_sentiment_async(self, comment: Comment) -> dict:
+        """Analyze sentiment of a comment without blocking the event loop.
+
+        The sync Z.ai client call runs in the default thread pool executor.
+
+        Args:
+            comment: Comment to analyze
+
+        Returns:
+            Dictionary with sentiment, confidence, and key points
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.analyze_sentiment, comment)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((APIConnectionError, APITimeoutError)),
+    )
+    def analyze_sentiments_batch(
+        self, comments: List[Comment]
+    ) -> Optional[List[dict]]:
+        """Analyze several comments in a single LLM request.
+
+        Args:
+            comments: Comments to analyze together
+
+        Returns:
+            One result per comment in input order, or None if the response
+            could not be parsed into exactly one result per comment
+        """
+        cache_keys = [self._cache_key(self._normalize_text(c.text)) for c in comments]
+        results = [self._cache_get(key) for key in cache_keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+
+        if misses:
+            fresh = self._request_sentiments_batch([comments[i] for i in misses])
+            if fresh is None:
+                return None
+            for i, result in zip(misses, fresh):
+                self._cache_set(cache_keys[i], result)
+                results[i] = result
+
+        return [
+            {**self._normalize_sentiment(result), "comment_id": comment.comment_id}
+            for result, comment in zip(results, comments)
+        ]
+
+    def _request_sentiments_batch(
+        self, comments: List[Comment]
+    ) -> Optional[List[dict]]:
+        """Send one batch request and parse it; see analyze_sentiments_batch."""
+        prompt = self._build_batch_sentiment_prompt(comments)
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a sentiment analysis expert. Analyze comments and classify them into categories. Respond with JSON only.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=min(
+                    _TOKENS_PER_BATCH_RESULT * len(comments),
+                    get_settings().LLM_MAX_OUTPUT_TOKENS,
+                ),
+            )
+
+            result_text = response.choices[0].message.content
+            return self._parse_batch_sentiment_response(result_text, comments)
+
+        except (APIStatusError, APIConnectionError) as e:
+            raise RuntimeError(f"LLM API error: {e}") from e
+
+    async def batch_analyze_async(
+        self,
+        comments: List[Comment],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> List[dict]:
-        """Analyze multiple comments in batches.
+        """Analyze multiple comments, one LLM request per batch.
+
+        Batches are sent concurrently. A batch whose request fails or whose
+        response cannot be aligned with its comments is retried one comment
+        at a time.
 
         Args:
             comments: List of comments to analyze
-            batch_size: Number of comments per batch (defaults to settings)
+            batch_size: Number of comments per request (defaults to settings),
+                capped so one request's answer fits in LLM_MAX_OUTPUT_TOKENS
+            concurrency: Maximum requests in flight (defaults to settings)
 
         Returns:
-            List of analysis results
+            List of analysis results, in the same order as ``comments``
         """
-        batch_size = batch_size or settings.BATCH_SIZE
-        results = []
+        settings = get_settings()
+        batch_size = min(
+            batch_size or settings.BATCH_SIZE,
+            max(1, settings.LLM_MAX_OUTPUT_TOKENS // _TOKENS_PER_BATCH_RESULT),
+        )
+        semaphore = asyncio.Semaphore(concurrency or settings.LLM_CONCURRENCY)
+        loop = asyncio.get_running_loop()
 
-        for i in range(0, len(comments), batch_size):
-            batch = comments[i : i + batch_size]
-            for comment in batch:
+        async def analyze(comment: Comment) -> dict:
+            async with semaphore:
                 try:
-                    result = self.analyze_sentiment(comment)
-                    results.append(result)
+                    result = await self.analyze_sentiment_async(comment)
+                    return {**result, "comment_id": comment.comment_id}
                 except Exception as e:
-                    results.append(
-                        {
-                            "comment_id": comment.comment_id,
-                            "sentiment": "neutral",
-                            "confidence": 0.0,
-                            "error": str(e),
-                        }
+                    return {
+                        "comment_id": comment.comment_id,
+                        "sentiment": "neutral",
+                        "confidence": 0.0,
+                        "error": str(e),
+                    }
+
+        async def analyze_batch(batch: List[Comment]) -> List[dict]:
+            async with semaphore:
+                try:
+                    results = await loop.run_in_executor(
+                        None, self.analyze_sentiments_batch, batch
                     )
+                except Exception:
+                    results = None
 
-        return results
+            if results is None:
+                return await asyncio.gather(*(analyze(c) for c in batch))
+            return results
+
+        batches = [
+            comments[i : i + batch_size] for i in range(0, len(comments), batch_size)
+        ]
+        batch_results = await asyncio.gather(*(analyze_batch(b) for b in batches))
+        return [result for results in batch_results for result in results]
+
+    def batch_analyze(
+        self, comments: List[Comment], batch_size: Optional[int] = None
+    ) -> List[dict]:
+        """Analyze multiple comments in batches from synchronous code.
+
+        Must not be called from a running event loop; use
+        :meth:`batch_analyze_async` there.
+
+        Args:
+            comments: List of comments to analyze
+            batch_size: Number of comments per request (defaults to settings)
+
+        Returns:
+            List of analysis results
+        """
+        return asyncio.run(self.batch_analyze_async(comments, batch_size))
+
+    @staticmethod
+    def to_analysis_results(results: List[dict]) -> List[AnalysisResult]:
+        """Validate raw analysis results into AnalysisResult models.
+
+        The whole list is validated in one call. If that fails, results are
+        validated one by one and the invalid ones are dropped.
+
+        Args:
+            results: Results from :meth:`batch_analyze_async`
+
+        Returns:
+            List of AnalysisResult models
+        """
+        try:
+            return _ANALYSIS_RESULTS_ADAPTER.validate_python(results)
+        except ValidationError:
+            valid = []
+            for result in results:
+                try:
+                    valid.append(AnalysisResult.model_validate(result))
+                except ValidationError:
+                    continue
+            return valid
+
+    def _cache_key(self, text: str, prefix: str = "sentiment") -> str:
+        """Build the cache key for a prompt input under the current model."""
+        digest = xxhash.xxh64_hexdigest(f"{self.model}:{text}".encode())
+        return f"{prefix}:{digest}"
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Collapse whitespace so copy-paste duplicates share a cache key.
+
+        Case is kept: it can carry sentiment ("GREAT" vs "great"), and text
+        that is already tidy keeps its original cache key.
+        """
+        return " ".join(text.split())
+
+    def _cache_get(self, key: str):
+        """Look up a cached result in memory, then in the persistent cache."""
+        value = self._memo.get(key)
+        if value is None and self.cache:
+            value = self.cache.get(key)
+            if value is not None:
+                self._memo[key] = value
+        # Callers normalize and extend results, so hand out a copy
+        return dict(value) if isinstance(value, dict) else value
+
+    def _cache_set(self, key: str, value):
+        """Store a result in memory and, if enabled, the persistent cache."""
+        self._memo[key] = value
+        if self.cache:
+            self.cache.set(key, value)
 
     def _build_sentiment_prompt(self, comment: Comment) -> str:
         """Build prompt for sentiment analysis.
@@ -181,6 +428,77 @@ Likes: {comment.like_count}
 
 Analyze the sentiment, confidence, extract key points, and provide a brief summary."""
 
+    def _build_batch_sentiment_prompt(self, comments: List[Comment]) -> str:
+        """Build prompt for analyzing several comments at once.
+
+        Args:
+            comments: Comments to analyze
+
+        Returns:
+            Prompt string
+        """
+        comment_lines = "\n".join(
+            f'{i}. "{c.text}" (Likes: {c.like_count})'
+            for i, c in enumerate(comments, 1)
+        )
+
+        return f"""Analyze the following {len(comments)} comments and classify each one. Respond with a JSON array of exactly {len(comments)} objects, in the same order as the comments, each in this exact format:
+{{
+    "sentiment": "positive|negative|neutral|suggestion|question",
+    "confidence": 0.0-1.0,
+    "key_points": ["point1", "point2"],
+    "summary": "brief summary"
+}}
+
+Comments:
+{comment_lines}"""
+
+    def _load_json(self, response_text: str, pattern=_JSON_OBJECT_RE):
+        """Decode the JSON value in a response, ignoring surrounding text.
+
+        Args:
+            response_text: Raw response from LLM
+            pattern: Regex locating the JSON value (object by default)
+
+        Returns:
+            Decoded JSON value
+
+        Raises:
+            orjson.JSONDecodeError: If no valid JSON value is found
+        """
+        fenced = _JSON_FENCE.search(response_text)
+        if fenced:
+            response_text = fenced.group(1)
+
+        match = pattern.search(response_text)
+        if not match:
+            return orjson.loads(response_text)
+
+        try:
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            balanced = _balanced_json_prefix(match.group(0))
+            if balanced is None:
+                raise
+            return orjson.loads(balanced)
+
+    def _normalize_sentiment(self, data: dict) -> dict:
+        """Map the response's sentiment label onto the Sentiment enum."""
+        sentiment_map = {
+            "positive": Sentiment.POSITIVE,
+            "negative": Sentiment.NEGATIVE,
+            "neutral": Sentiment.NEUTRAL,
+            "suggestion": Sentiment.SUGGESTION,
+            "question": Sentiment.QUESTION,
+        }
+
+        label = data.get("sentiment")
+        if isinstance(label, str):
+            label = label.strip().lower()
+        # An unknown label (e.g. "mixed") counts as neutral for this item only
+        data["sentiment"] = sentiment_map.get(label, Sentiment.NEUTRAL)
+        return data
+
     def _parse_sentiment_response(self, response_text: str) -> dict:
         """Parse LLM response to extract sentiment data.
 
@@ -191,26 +509,9 @@ Analyze the sentiment, confidence, extract key points, and provide a brief summa
             Parsed dictionary
         """
         try:
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:-3]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:-3]
-
-            data = json.loads(response_text)
-
-            sentiment_map = {
-                "positive": Sentiment.POSITIVE,
-                "negative": Sentiment.NEGATIVE,
-                "neutral": Sentiment.NEUTRAL,
-                "suggestion": Sentiment.SUGGESTION,
-                "question": Sentiment.QUESTION,
-            }
+            return self._normalize_sentiment(self._load_json(response_text))
 
-            data["sentiment"] = sentiment_map.get(data.get("sentiment", "neutral"))
-            return data
-
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return {
                 "sentiment": Sentiment.NEUTRAL,
                 "confidence": 0.0,
@@ -218,3 +519,38 @@ Analyze the sentiment, confidence, extract key points, and provide a brief summa
                 "summary": response_text[:200],
                 "error": "Failed to parse JSON response",
             }
+
+    def _parse_batch_sentiment_response(
+        self, response_text: str, comments: List[Comment]
+    ) -> Optional[List[dict]]:
+        """Parse a batch response into one result per comment.
+
+        Args:
+            response_text: Raw response from LLM
+            comments: Comments the response should cover, in order
+
+        Returns:
+            Parsed results, or None if the response is not a JSON array of
+            one valid result object per comment
+        """
+        try:
+            data = self._load_json(response_text, _JSON_ARRAY_RE)
+        except orjson.JSONDecodeError:
+            return None
+
+        if not isinstance(data, list) or len(data) != len(comments):
+            return None
+        if not all(isinstance(item, dict) for item in data):
+            return None
+
+        results = [self._normalize_sentiment(item) for item in data]
+        try:
+            _ANALYSIS_RESULTS_ADAPTER.validate_python(
+                [
+                    {**result, "comment_id": comment.comment_id}
+                    for result, comment in zip(results, comments)
+                ]
+            )
+        except ValidationError:
+            return None
+        return results
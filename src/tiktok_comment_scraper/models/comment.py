@@ -1,10 +1,11 @@
 """Data models for comments and analysis."""
 
+from collections import Counter
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 
 class Sentiment(str, Enum):
@@ -17,6 +18,12 @@ class Sentiment(str, Enum):
     QUESTION = "question"
 
 
+# Used for model fields: pydantic checks a Literal by plain membership,
+# while an Enum field also has to look up and build the member. Sentiment
+# members still validate since they are str subclasses.
+SentimentLiteral = Literal["positive", "negative", "neutral", "suggestion", "question"]
+
+
 class CommentAuthor(BaseModel):
     """Author information for a comment."""
 
@@ -38,14 +45,11 @@ class Comment(BaseModel):
     parent_comment_id: Optional[str] = None
     created_at: datetime
     is_pinned: bool = False
-    sentiment: Optional[Sentiment] = None
+    sentiment: Optional[SentimentLiteral] = None
 
-    class Config:
-        """Pydantic config."""
-
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
+    @field_serializer("created_at", when_used="json")
+    def _serialize_created_at(self, value: datetime) -> str:
+        return value.isoformat()
 
 
 class CommentThread(BaseModel):
@@ -68,7 +72,7 @@ class AnalysisResult(BaseModel):
     """Result of sentiment analysis and summarization."""
 
     comment_id: str
-    sentiment: Sentiment
+    sentiment: SentimentLiteral
     confidence: float = Field(ge=0.0, le=1.0)
     key_points: List[str] = Field(default_factory=list)
     summary: Optional[str] = None
@@ -87,9 +91,6 @@ class VideoSummary(BaseModel):
 
     def calculate_sentiment_distribution(self):
         """Calculate distribution of sentiments across all analyzed comments."""
-        self.sentiment_distribution = {}
-        for result in self.analysis_results:
-            sentiment = result.sentiment.value
-            self.sentiment_distribution[sentiment] = (
-                self.sentiment_distribution.get(sentiment, 0) + 1
-            )
+        self.sentiment_distribution = dict(
+            Counter(result.sentiment for result in self.analysis_results)
+        )
@@ -1,18 +1,46 @@
 """TikTok/Douyin comment scraper with anti-detection."""
 
 import asyncio
-import json
 import random
+import re
 import time
-from typing import List, Optional
+from contextlib import AsyncExitStack, suppress
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 
 import httpx
+import orjson
+import xxhash
 from fake_useragent import UserAgent
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
+from pydantic import TypeAdapter, ValidationError
 
-from tiktok_comment_scraper.config.settings import settings
+from tiktok_comment_scraper.config.settings import get_settings
 from tiktok_comment_scraper.models.comment import Comment, CommentAuthor
 
+_COMMENTS_ADAPTER = TypeAdapter(List[Comment])
+_VIDEO_ID_RE = re.compile(r"/video/([^?]+)")
+
+# Resource types the comment DOM never needs
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+COMMENT_LIST_SELECTOR = '[data-e2e="comment-list"]'
+# Union of the known comment containers, resolved in one browser round-trip
+COMMENT_SCROLL_SELECTOR = (
+    'div[data-e2e="comment-list"], div[class*="comment"], [class*="CommentsList"]'
+)
+
+# Bound once to skip the attribute lookup in per-comment loops
+_now = datetime.now
+_from_ts = datetime.fromtimestamp
+# Unlike hash(), stable across processes, so synthetic user IDs are too
+_hash = xxhash.xxh3_64_intdigest
+
+
+def _optional_str(value) -> Optional[str]:
+    """Coerce a numeric API ID to ``str``; pydantic v2 will not do it."""
+    return None if value is None else str(value)
+
 
 class TikTokScraper:
     """Scraper for TikTok/Douyin comments with anti-detection."""
@@ -30,6 +58,7 @@ class TikTokScraper:
             user_agent: Optional custom user agent
             headless: Run browser in headless mode
         """
+        settings = get_settings()
         self.proxy_url = proxy_url or settings.PROXY_URL
         self.user_agent = user_agent or settings.USER_AGENT
         if not self.user_agent:
@@ -85,7 +114,17 @@ class TikTokScraper:
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
             });
+            window.__scrapedIds = window.__scrapedIds || new Set();
         """)
+        await self.context.route("**/*", self._filter_route)
+
+    @staticmethod
+    async def _filter_route(route):
+        """Abort images, media and fonts; let everything else through."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def _close_browser(self):
         """Close browser and cleanup."""
@@ -108,15 +147,14 @@ class TikTokScraper:
         Returns:
             List of Comment objects
         """
+        page = None
         try:
             page = await self.context.new_page()
 
             await self._navigate_with_retry(page, video_url)
 
-            await page.wait_for_timeout(2000)
-
             comments = []
-            page.goto(video_url)
+            scroll_target = page.locator(COMMENT_SCROLL_SELECTOR).first
 
             last_comment_count = 0
             consecutive_no_new = 0
@@ -126,9 +164,9 @@ class TikTokScraper:
                 if max_comments and len(comments) >= max_comments:
                     break
 
-                await self._scroll_comments(page)
+                await self._scroll_comments(page, scroll_target)
 
-                new_comments = await self._extract_comments(page, comments)
+                new_comments = await self._extract_comments(page, len(comments))
                 comments.extend(new_comments)
 
                 print(f"Scraped {len(comments)} comments...")
@@ -142,52 +180,108 @@ class TikTokScraper:
 
                 await page.wait_for_timeout(random.randint(1000, 2000))
 
-            await page.close()
             return comments
 
         except Exception as e:
             raise RuntimeError(f"Error scraping comments: {e}")
+        finally:
+            if page is not None:
+                await page.close()
+
+    async def scrape_many(
+        self,
+        video_urls: List[str],
+        concurrency: int = 4,
+        max_comments: Optional[int] = None,
+    ) -> Dict[str, Union[List[Comment], BaseException]]:
+        """Scrape several videos concurrently in the shared browser context.
+
+        Each video gets its own page in ``self.context``, so the browser is
+        launched once for the whole batch. A failing video does not stop the
+        others; its error is reported and returned in place of its comments.
+
+        Args:
+            video_urls: URLs of the TikTok/Douyin videos
+            concurrency: Maximum number of pages open at the same time
+            max_comments: Maximum number of comments to fetch per video
+
+        Returns:
+            Mapping of video URL to its list of Comment objects, or to the
+            exception raised while scraping it
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(video_url: str) -> List[Comment]:
+            async with semaphore:
+                return await self.scrape_video_comments(video_url, max_comments)
+
+        results = await asyncio.gather(
+            *(scrape_one(url) for url in video_urls), return_exceptions=True
+        )
+        for video_url, result in zip(video_urls, results):
+            if isinstance(result, BaseException):
+                print(f"Failed to scrape {video_url}: {result}")
+        return dict(zip(video_urls, results))
 
     async def _navigate_with_retry(self, page, url: str):
-        """Navigate to URL with retry logic."""
+        """Navigate to URL with retry logic.
+
+        Only waits for the DOM and the comment list instead of the full
+        ``load`` event, which would also wait for video previews and fonts.
+        """
         for attempt in range(self.max_retries):
             try:
-                await page.goto(url, timeout=self.timeout * 1000)
-                return
+                await page.goto(
+                    url, timeout=self.timeout * 1000, wait_until="domcontentloaded"
+                )
+                break
             except Exception as e:
                 if attempt == self.max_retries - 1:
                     raise
                 await asyncio.sleep(2 ** attempt)
 
-    async def _scroll_comments(self, page):
-        """Scroll to load more comments."""
-        selectors = [
-            'div[data-e2e="comment-list"]',
-            'div[class*="comment"]',
-            '[class*="CommentsList"]',
-        ]
+        try:
+            await page.wait_for_selector(
+                COMMENT_LIST_SELECTOR, timeout=self.timeout * 1000
+            )
+        except PlaywrightTimeoutError:
+            # Layouts without the data-e2e marker still go through scrolling
+            pass
 
-        for selector in selectors:
-            try:
-                element = page.locator(selector).first
-                if await element.count() > 0:
-                    await element.scroll_into_view_if_needed()
-                    break
-            except:
-                continue
+    async def _scroll_comments(self, page, scroll_target):
+        """Scroll to load more comments.
+
+        Args:
+            page: Playwright page being scraped
+            scroll_target: Locator for the comment container of that page
+        """
+        try:
+            await scroll_target.scroll_into_view_if_needed(timeout=1000)
+        except Exception:
+            pass
 
         await page.keyboard.press("PageDown")
         await page.wait_for_timeout(500)
 
-    async def _extract_comments(
-        self, page, existing_comments: List[Comment]
-    ) -> List[Comment]:
-        """Extract comments from current page state."""
+    async def _extract_comments(self, page, start_index: int) -> List[Comment]:
+        """Extract comments from current page state.
+
+        Deduplication happens in the page: IDs of nodes already returned are
+        kept in ``window.__scrapedIds``, so only new comments cross over.
+
+        Args:
+            page: Playwright page to read comments from
+            start_index: Number of comments scraped so far, used for IDs
+
+        Returns:
+            Comments not returned by previous passes
+        """
         new_comments = []
 
         try:
             content = await page.content()
             comment_data = await page.evaluate("""() => {
+                const seen = window.__scrapedIds = window.__scrapedIds || new Set();
                 const comments = [];
                 const commentElements = document.querySelectorAll('[class*="comment"], [data-e2e*="comment"]');
                 
@@ -198,9 +292,14 @@ class TikTokScraper:
                         const likeEl = el.querySelector('[class*="like"]');
                         
                         if (textEl && authorEl) {
+                            const text = textEl.textContent?.trim() || '';
+                            const author = authorEl.textContent?.trim() || 'Anonymous';
+                            const id = el.getAttribute('data-e2e-id') || el.id || `${author}|${text}`;
+                            if (seen.has(id)) return;
+                            seen.add(id);
                             comments.push({
-                                text: textEl.textContent?.trim() || '',
-                                author: authorEl.textContent?.trim() || 'Anonymous',
+                                text: text,
+                                author: author,
                                 likes: likeEl ? parseInt(likeEl.textContent) || 0 : 0
                             });
                         }
@@ -213,27 +312,25 @@ class TikTokScraper:
             }""")
 
             video_id = self._extract_video_id(page.url)
+            scraped_at = _now()
 
             for idx, data in enumerate(comment_data):
-                comment_id = f"{video_id}_comment_{len(existing_comments) + idx}"
+                comment_id = f"{video_id}_comment_{start_index + idx}"
 
-                if any(c.comment_id == comment_id for c in existing_comments):
-                    continue
-
-                author = CommentAuthor(
+                # The payload shape is fixed by our own JS above, so skip
+                # per-field validation
+                author = CommentAuthor.model_construct(
                     username=data.get("author", "anonymous"),
-                    user_id=f"user_{hash(data.get('author', '')) % 1000000}",
+                    user_id=f"user_{_hash(data.get('author', '').encode('utf-8')) % 1000000}",
                 )
 
-                from datetime import datetime
-
-                comment = Comment(
+                comment = Comment.model_construct(
                     comment_id=comment_id,
                     video_id=video_id,
                     text=data.get("text", ""),
                     author=author,
                     like_count=data.get("likes", 0),
-                    created_at=datetime.now(),
+                    created_at=scraped_at,
                 )
 
                 new_comments.append(comment)
@@ -245,12 +342,13 @@ class TikTokScraper:
 
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from URL."""
-        try:
-            if "/video/" in url:
-                return url.split("/video/")[-1].split("?")[0]
-            return "unknown_video"
-        except:
-            return "unknown_video"
+        match = _VIDEO_ID_RE.search(url)
+        return match.group(1) if match else "unknown_video"
+
+    def _extract_video_ids(self, urls: List[str]) -> List[str]:
+        """Extract video IDs from several URLs."""
+        search = _VIDEO_ID_RE.search
+        return [m.group(1) if m else "unknown_video" for m in map(search, urls)]
 
 
 class TikTokAPIScraper:
@@ -262,15 +360,44 @@ class TikTokAPIScraper:
         Args:
             proxy_url: Optional proxy URL
         """
+        settings = get_settings()
         self.proxy_url = proxy_url or settings.PROXY_URL
         self.timeout = settings.TIKTOK_TIMEOUT
         self.base_url = "https://www.tiktok.com"
+        # UserAgent() loads its whole dataset, so build it once per scraper
+        self._ua = UserAgent()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        self._client = self._create_client()
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.__aexit__(exc_type, exc_val, exc_tb)
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create an HTTP/2 client that keeps connections alive between pages."""
+        proxies = {"http://": self.proxy_url, "https://": self.proxy_url} if self.proxy_url else None
+        return httpx.AsyncClient(
+            http2=True,
+            proxies=proxies,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
 
     async def scrape_video_comments(
         self, video_url: str, max_comments: Optional[int] = None
     ) -> List[Comment]:
         """Scrape comments using hidden API.
 
+        Uses the scraper's pooled client when entered as an async context
+        manager, otherwise a client scoped to this call.
+
         Args:
             video_url: Video URL
             max_comments: Maximum comments to fetch
@@ -279,83 +406,154 @@ class TikTokAPIScraper:
             List of Comment objects
         """
         video_id = self._extract_video_id(video_url)
+        headers = {
+            "User-Agent": self._ua.random,
+            "Referer": video_url,
+        }
 
-        proxies = {"http://": self.proxy_url, "https://": self.proxy_url} if self.proxy_url else None
-
-        async with httpx.AsyncClient(proxies=proxies, timeout=self.timeout) as client:
-            comments = []
-            cursor = "0"
-
-            while True:
-                if max_comments and len(comments) >= max_comments:
-                    break
+        async with AsyncExitStack() as stack:
+            client = self._client
+            if client is None:
+                client = await stack.enter_async_context(self._create_client())
 
-                try:
-                    response = await client.get(
+            def fetch_page(cursor: str) -> "asyncio.Task":
+                return asyncio.create_task(
+                    client.get(
                         f"{self.base_url}/api/comment/list/",
                         params={
                             "aweme_id": video_id,
                             "count": 20,
                             "cursor": cursor,
                         },
-                        headers={
-                            "User-Agent": UserAgent().random,
-                            "Referer": video_url,
-                        },
+                        headers=headers,
                     )
+                )
 
-                    if response.status_code != 200:
-                        break
+            comments = []
+            # The next page is requested as soon as its cursor is known, so
+            # it is in flight while the current page is parsed and we sleep
+            pending: Optional[asyncio.Task] = fetch_page("0")
+
+            try:
+                while pending is not None:
+                    try:
+                        response = await pending
+                        pending = None
 
-                    data = response.json()
+                        if response.status_code != 200:
+                            break
 
-                    if not data.get("comments"):
-                        break
+                        page_comments, cursor, has_more = self._decode_page(
+                            response.content
+                        )
+
+                        if not page_comments:
+                            break
 
-                    for comment_data in data["comments"]:
-                        comment = self._parse_comment(comment_data, video_id)
-                        comments.append(comment)
+                        fetched = len(comments) + len(page_comments)
+                        if (
+                            cursor
+                            and has_more is not False
+                            and not (max_comments and fetched >= max_comments)
+                        ):
+                            pending = fetch_page(cursor)
 
-                    cursor = data.get("cursor", "")
-                    if not cursor or data.get("has_more", False) is False:
+                        comments.extend(self._parse_comments(page_comments, video_id))
+
+                        if pending is not None:
+                            await asyncio.sleep(random.uniform(0.5, 1.5))
+
+                    except Exception as e:
+                        print(f"Error fetching comments: {e}")
                         break
+            finally:
+                if pending is not None:
+                    pending.cancel()
+                    # Wait for the prefetch to unwind before the client can
+                    # close; its outcome is no longer needed
+                    with suppress(asyncio.CancelledError, Exception):
+                        await pending
 
-                    await asyncio.sleep(random.uniform(0.5, 1.5))
+            return comments
 
-                except Exception as e:
-                    print(f"Error fetching comments: {e}")
-                    break
+    @staticmethod
+    def _decode_page(raw: bytes) -> Tuple[List[dict], str, bool]:
+        """Decode one page of the comment list API.
+
+        Decodes the raw response body directly instead of going through
+        ``response.json()``, which first builds a ``str`` copy of the body.
+
+        Args:
+            raw: Raw response body
+
+        Returns:
+            Tuple of (comment payloads, next cursor, has_more flag)
+        """
+        data = orjson.loads(raw)
+        return (
+            data.get("comments") or [],
+            data.get("cursor", ""),
+            data.get("has_more", False),
+        )
+
+    def _parse_comments(self, rows: List[dict], video_id: str) -> List[Comment]:
+        """Parse one page of comments from the API response.
+
+        The raw rows are reshaped to the ``Comment`` schema first and then
+        validated together, so pydantic walks its validator graph once per
+        page rather than once per comment.
+
+        Args:
+            rows: Comment payloads from the API response
+            video_id: ID of the video the comments belong to
 
+        Returns:
+            List of Comment objects; rows that fail validation are skipped
+        """
+        comment_rows = [self._comment_row(data, video_id) for data in rows]
+        try:
+            return _COMMENTS_ADAPTER.validate_python(comment_rows)
+        except ValidationError:
+            # Fall back to row by row so one bad row costs only itself
+            comments = []
+            for row in comment_rows:
+                try:
+                    comments.append(Comment.model_validate(row))
+                except ValidationError as e:
+                    print(f"Skipping invalid comment {row['comment_id']!r}: {e}")
             return comments
 
     def _parse_comment(self, data: dict, video_id: str) -> Comment:
         """Parse comment data from API response."""
-        from datetime import datetime
-
-        comment_id = data.get("cid", "")
+        return Comment.model_validate(self._comment_row(data, video_id))
 
+    @staticmethod
+    def _comment_row(data: dict, video_id: str) -> dict:
+        """Map an API comment payload onto the ``Comment`` schema."""
         author_data = data.get("user", {})
-        author = CommentAuthor(
-            username=author_data.get("unique_id", "anonymous"),
-            display_name=author_data.get("nickname"),
-            user_id=str(author_data.get("uid", "")),
-            avatar_url=author_data.get("avatar_thumb", {}).get("url_list", [""])[0],
-        )
-
-        return Comment(
-            comment_id=comment_id,
-            video_id=video_id,
-            text=data.get("text", ""),
-            author=author,
-            like_count=data.get("digg_count", 0),
-            reply_count=data.get("reply_comment_total", 0),
-            parent_comment_id=data.get("reply_to_reply_id"),
-            created_at=datetime.fromtimestamp(data.get("create_time", time.time())),
-            is_pinned=data.get("is_pinned", False),
-        )
+        return {
+            "comment_id": str(data.get("cid", "")),
+            "video_id": video_id,
+            "text": data.get("text", ""),
+            "author": {
+                "username": author_data.get("unique_id", "anonymous"),
+                "display_name": author_data.get("nickname"),
+                "user_id": str(author_data.get("uid", "")),
+                "avatar_url": author_data.get("avatar_thumb", {}).get("url_list", [""])[0],
+            },
+            "like_count": data.get("digg_count") or 0,
+            "reply_count": data.get("reply_comment_total") or 0,
+            "parent_comment_id": _optional_str(data.get("reply_to_reply_id")),
+            "created_at": _from_ts(data.get("create_time") or time.time()),
+            "is_pinned": data.get("is_pinned", False),
+        }
 
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from URL."""
-        if "/video/" in url:
-            return url.split("/video/")[-1].split("?")[0]
-        return ""
+        match = _VIDEO_ID_RE.search(url)
+        return match.group(1) if match else ""
+
+    def _extract_video_ids(self, urls: List[str]) -> List[str]:
+        """Extract video IDs from several URLs."""
+        search = _VIDEO_ID_RE.search
+        return [m.group(1) if m else "" for m in map(search, urls)]
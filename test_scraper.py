@@ -10,22 +10,30 @@ import sys
 from datetime import datetime
 from typing import List, Dict, Any
 
+try:
+    import orjson
+except ImportError:  # allow running before dependencies are installed
+    orjson = None
+
 
 class MockComment:
     """Simple mock comment for testing."""
 
+    __slots__ = ("comment_id", "text", "likes", "created_at", "_iso")
+
     def __init__(self, comment_id: str, text: str, likes: int = 0):
         self.comment_id = comment_id
         self.text = text
         self.likes = likes
         self.created_at = datetime.now()
+        self._iso = self.created_at.isoformat()
 
     def to_dict(self):
         return {
             "comment_id": self.comment_id,
             "text": self.text,
             "likes": self.likes,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._iso,
         }
 
 
@@ -112,8 +120,16 @@ async def test_douyin_url(url: str):
         "status": "test_mode",
     }
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(
+                result,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str,
+            ))
+    else:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
 
     print("=" * 60)
     print(f"✓ 测试结果已保存到: {output_file}")
@@ -0,0 +1,42 @@
+"""Shared fixtures for unit tests."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_asyncio import is_async_test
+
+from tiktok_comment_scraper.config.settings import get_settings
+
+
+def pytest_collection_modifyitems(items):
+    """Run all async tests on one session-scoped event loop."""
+    session_scope_marker = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _zai_api_key():
+    """Provide an API key for the whole session, including session fixtures."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ZAI_API_KEY", "test_api_key")
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings():
+    """Build settings from each test's own environment."""
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _patch_zai():
+    """Replace the Z.ai SDK client for the whole session."""
+    mock_zai = MagicMock()
+    # The monkeypatch fixture is function-scoped, so open a session-long one
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("tiktok_comment_scraper.llm.client.ZaiClient", mock_zai)
+        yield mock_zai
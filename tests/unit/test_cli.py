@@ -0,0 +1,72 @@
+"""Test the CLI workflow."""
+
+from datetime import datetime
+
+import orjson
+
+from tiktok_comment_scraper import cli
+from tiktok_comment_scraper.llm.client import LLMClient
+from tiktok_comment_scraper.models.comment import Comment, CommentAuthor
+
+
+class _FakeScraper:
+    """Async context manager returning fixed comments."""
+
+    def __init__(self, comments):
+        self.comments = comments
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def scrape_video_comments(self, video_url, max_comments=None):
+        return self.comments[:max_comments]
+
+    def _extract_video_id(self, url):
+        return "123"
+
+
+class _FakeLLM:
+    """LLM client answering every comment as positive."""
+
+    to_analysis_results = staticmethod(LLMClient.to_analysis_results)
+
+    async def batch_analyze_async(self, comments):
+        return [
+            {"comment_id": c.comment_id, "sentiment": "positive", "confidence": 0.9}
+            for c in comments
+        ]
+
+    def summarize_comments(self, comments):
+        return "all good"
+
+
+async def test_scrape_and_analyze(monkeypatch, tmp_path):
+    """Test scraping, analysis and the saved summary file."""
+    author = CommentAuthor(username="u", user_id="1")
+    comments = [
+        Comment(
+            comment_id=f"c{i}",
+            video_id="123",
+            text=f"Comment {i}",
+            author=author,
+            created_at=datetime(2023, 1, 1),
+        )
+        for i in range(3)
+    ]
+    monkeypatch.setattr(cli, "TikTokAPIScraper", lambda: _FakeScraper(comments))
+    monkeypatch.setattr(cli, "LLMClient", _FakeLLM)
+
+    summary = await cli.scrape_and_analyze(
+        "https://www.tiktok.com/@user/video/123",
+        max_comments=2,
+        output_dir=str(tmp_path),
+    )
+
+    assert summary.total_comments == 2
+    assert summary.sentiment_distribution == {"positive": 2}
+    assert summary.overall_summary == "all good"
+    saved = orjson.loads((tmp_path / "123_summary.json").read_bytes())
+    assert saved["comments"][0]["created_at"] == "2023-01-01T00:00:00"
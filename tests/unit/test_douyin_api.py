@@ -0,0 +1,241 @@
+"""Test Douyin API scraper."""
+
+import io
+
+import httpx
+import orjson
+import pytest
+
+from douyin_api import DouyinAPIScraper, RateLimiter, _FetchWindow
+
+
+def _page(comments, cursor=None, has_more=1):
+    """Build a comment list response."""
+    data = {"aweme_comments": comments, "has_more": has_more}
+    if cursor is not None:
+        data["cursor"] = cursor
+    return httpx.Response(200, content=orjson.dumps(data))
+
+
+def _comment(cid):
+    """Build one raw API comment."""
+    return {"cid": cid, "text": f"comment {cid}", "digg_count": 1}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("douyin_api.asyncio.sleep", fake_sleep)
+    monkeypatch.setattr("douyin_api.random.random", lambda: 0.0)
+    return delays
+
+
+@pytest.fixture
+def scraper():
+    """Create a scraper fetching one page at a time into an in-memory sink."""
+    scraper = DouyinAPIScraper(concurrency=1, requests_per_second=1000)
+    scraper.max_pages = 5
+    scraper._sink = io.BytesIO()
+    return scraper
+
+
+class TestFetchRemainingPages:
+    """Test concurrent pagination after the first page."""
+
+    async def _run(self, scraper, pages, max_comments=None):
+        """Serve ``pages`` by cursor and record the cursors requested."""
+        requested = []
+
+        def handler(request):
+            cursor = request.url.params["cursor"]
+            requested.append(cursor)
+            return pages.get(cursor) or _page([])
+
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            loaded = await scraper._fetch_remaining_pages(
+                client, "v1", 20, max_comments
+            )
+        return loaded, requested
+
+    async def test_filtered_page_does_not_stop_pagination(self, scraper):
+        """Test that a page with only text-less comments is skipped over."""
+        pages = {
+            "20": _page([{"cid": "no-text"}], cursor=40),
+            "40": _page([_comment("a")], cursor=60, has_more=0),
+        }
+
+        loaded, requested = await self._run(scraper, pages)
+
+        assert loaded == 2
+        assert scraper.total_comments == 1
+        assert requested == ["20", "40"]
+
+    @pytest.mark.parametrize(
+        "last_page,loaded_pages,total",
+        [
+            ({"comments": [], "cursor": 60}, 1, 1),
+            ({"comments": [_comment("b")]}, 2, 2),
+        ],
+        ids=["empty-raw-page", "missing-cursor"],
+    )
+    async def test_stops_at_end_of_data(
+        self, scraper, last_page, loaded_pages, total
+    ):
+        """Test that an empty raw page or a missing cursor ends pagination."""
+        pages = {"20": _page([_comment("a")], cursor=40), "40": _page(**last_page)}
+
+        loaded, requested = await self._run(scraper, pages)
+
+        assert loaded == loaded_pages
+        assert scraper.total_comments == total
+        assert requested == ["20", "40"]
+
+    async def test_stops_at_max_comments(self, scraper):
+        """Test that no page is requested once the target is reached."""
+        pages = {
+            "20": _page([_comment("a")], cursor=40),
+            "40": _page([_comment("b")], cursor=60),
+            "60": _page([_comment("c")], cursor=80),
+        }
+
+        loaded, requested = await self._run(scraper, pages, max_comments=2)
+
+        assert loaded == 2
+        assert requested == ["20", "40"]
+
+    async def test_progress_counts_the_first_page(self, scraper, caplog):
+        """Test that batched progress reports the total pages loaded."""
+        scraper.max_pages = 10
+        pages = {
+            str(cursor): _page([_comment(str(cursor))], cursor=cursor + 20)
+            for cursor in range(20, 200, 20)
+        }
+
+        with caplog.at_level("INFO", logger="douyin_api"):
+            loaded, _ = await self._run(scraper, pages)
+
+        assert loaded == 9
+        assert "📥 已加载 10 页 (总计: 9 条)" in caplog.messages
+
+
+class TestFetchWithRetry:
+    """Test retrying transient failures with backoff."""
+
+    async def _fetch(self, scraper, responses, retries=2):
+        """Answer successive requests from ``responses``."""
+        calls = []
+
+        def handler(request):
+            response = responses[min(len(calls), len(responses) - 1)]
+            calls.append(request)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            try:
+                result = await scraper._fetch_with_retry(
+                    client, "https://example.com/", {}, {}, retries=retries
+                )
+            except httpx.TimeoutException as e:
+                result = e
+        return result, calls
+
+    async def test_gives_up_after_retries(self, scraper, sleeps):
+        """Test that a persistent 503 is returned after exhausting retries."""
+        response, calls = await self._fetch(scraper, [httpx.Response(503)])
+
+        assert response.status_code == 503
+        assert len(calls) == 3
+        assert sleeps == [0.5, 1.0]
+
+    async def test_timeout_raised_after_retries(self, scraper, sleeps):
+        """Test that the last timeout propagates once retries run out."""
+        error, calls = await self._fetch(scraper, [httpx.ReadTimeout("slow")])
+
+        assert isinstance(error, httpx.ReadTimeout)
+        assert len(calls) == 3
+        assert len(sleeps) == 2
+
+    async def test_honors_retry_after(self, scraper, sleeps):
+        """Test that a 429 waits for Retry-After, then succeeds."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200),
+        ]
+
+        response, calls = await self._fetch(scraper, responses)
+
+        assert response.status_code == 200
+        assert sleeps == [3.0]
+
+    async def test_does_not_retry_client_errors(self, scraper, sleeps):
+        """Test that a non-retryable status is returned immediately."""
+        response, calls = await self._fetch(scraper, [httpx.Response(404)])
+
+        assert response.status_code == 404
+        assert len(calls) == 1
+        assert sleeps == []
+
+    async def test_fetch_page_returns_none_on_timeout(self, scraper, sleeps):
+        """Test that _fetch_page turns exhausted timeouts into a miss."""
+
+        def handler(request):
+            raise httpx.ConnectTimeout("slow")
+
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert await scraper._fetch_page(client, "v1", "0") is None
+        assert len(sleeps) == 4
+
+
+class TestRateLimiter:
+    """Test the token-bucket limiter."""
+
+    async def test_waits_once_burst_is_spent(self, monkeypatch):
+        """Test that requests beyond the burst wait for a refill."""
+        limiter = RateLimiter(requests_per_second=2)
+        delays = []
+
+        async def fake_sleep(delay):
+            # Let the bucket see the time as having passed
+            delays.append(delay)
+            limiter.updated_at -= delay
+
+        monkeypatch.setattr("douyin_api.asyncio.sleep", fake_sleep)
+
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert len(delays) == 1
+        assert delays[0] == pytest.approx(0.5, abs=0.01)
+
+
+class TestFetchWindow:
+    """Test the stop point shared by page workers."""
+
+    def test_close_at_keeps_earliest_cursor(self):
+        """Test that the window closes at the lowest reported cursor."""
+        window = _FetchWindow(fetched=0, max_comments=None)
+        assert not window.is_past_end(1000)
+
+        window.close_at(60)
+        window.close_at(80)
+
+        assert window.end_cursor == 60
+        assert window.is_past_end(80)
+        assert not window.is_past_end(60)
+
+    @pytest.mark.parametrize(
+        "fetched,max_comments,full", [(5, None, False), (4, 5, False), (5, 5, True)]
+    )
+    def test_is_full(self, fetched, max_comments, full):
+        """Test that the window is full only once the target is reached."""
+        assert _FetchWindow(fetched, max_comments).is_full() is full
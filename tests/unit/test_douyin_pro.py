@@ -0,0 +1,225 @@
+"""Test Douyin Pro scraper helpers."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from douyin_pro import BloomFilter, BrowserPool, DouyinScraperPro
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Create a one-context pool backed by a fake context factory."""
+    monkeypatch.setattr("douyin_pro.MAX_USES_PER_CONTEXT", 2)
+    pool = BrowserPool(size=1, user_agent="test-agent")
+    pool.created = []
+    pool.fail_next = False
+
+    async def new_context():
+        if pool.fail_next:
+            pool.fail_next = False
+            raise RuntimeError("browser crashed")
+        context = AsyncMock()
+        pool._uses[context] = 0
+        pool.created.append(context)
+        return context
+
+    monkeypatch.setattr(pool, "_new_context", new_context)
+    return pool
+
+
+class TestBloomFilter:
+    """Test BloomFilter class."""
+
+    def test_no_false_negatives(self):
+        """Test that every added text is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+        texts = [f"评论 {i}" for i in range(1000)]
+        for text in texts:
+            bloom.add(text)
+
+        assert all(text in bloom for text in texts)
+        # Far below capacity the false-positive rate stays near error_rate
+        assert sum(f"other {i}" in bloom for i in range(1000)) < 20
+
+    def test_save_load_round_trip(self, tmp_path):
+        """Test that a saved filter loads back with the same members."""
+        bloom = BloomFilter(capacity=100)
+        for text in ("a", "b", "好评"):
+            bloom.add(text)
+        path = tmp_path / "seen" / "bloom.bin"
+
+        bloom.save(path)
+        loaded = BloomFilter.load(path)
+
+        assert (loaded.num_bits, loaded.num_hashes) == (
+            bloom.num_bits,
+            bloom.num_hashes,
+        )
+        assert loaded.bits == bloom.bits
+        assert (loaded.capacity, loaded.count) == (100, 3)
+        assert all(text in loaded for text in ("a", "b", "好评"))
+        assert not path.with_suffix(".bin.tmp").exists()
+
+    def test_count_ignores_repeated_adds(self):
+        """Test that only distinct texts count towards capacity."""
+        bloom = BloomFilter(capacity=2)
+        bloom.add("a")
+        bloom.add("a")
+        assert not bloom.is_full()
+
+        bloom.add("b")
+        assert bloom.is_full()
+
+    def test_load_legacy_file_estimates_count(self, tmp_path):
+        """Test that a file saved without an item count still loads."""
+        bloom = BloomFilter(capacity=1000)
+        for i in range(200):
+            bloom.add(f"评论 {i}")
+        path = tmp_path / "legacy.bin"
+        path.write_bytes(
+            BloomFilter._LEGACY_HEADER.pack(bloom.num_bits, bloom.num_hashes)
+            + bloom.bits
+        )
+
+        loaded = BloomFilter.load(path)
+
+        assert "评论 7" in loaded
+        assert loaded.capacity == pytest.approx(1000, rel=0.05)
+        assert loaded.count == pytest.approx(200, rel=0.05)
+
+    def test_scraper_replaces_full_seen_file(self, tmp_path, capsys):
+        """Test that a filter loaded at capacity is replaced, with a warning."""
+        path = tmp_path / "seen.bin"
+        full = BloomFilter(capacity=1)
+        full.add("old")
+        full.save(path)
+
+        scraper = DouyinScraperPro(seen_file=path, seen_capacity=50)
+
+        assert "old" not in scraper.seen
+        assert scraper.seen.capacity == 50
+        assert "去重文件已满" in capsys.readouterr().out
+
+    async def test_scraper_replaces_filter_filled_mid_run(self):
+        """Test that new comments keep arriving once the filter fills up."""
+        scraper = DouyinScraperPro(seen_capacity=2)
+        page = AsyncMock()
+        page.evaluate.return_value = [{"text": f"comment {i}"} for i in range(5)]
+
+        assert await scraper._scroll_and_extract(page) == 5
+        assert scraper.seen.count == 1
+
+    async def test_scraper_skips_comments_from_seen_file(self, tmp_path):
+        """Test that a persisted filter deduplicates across runs."""
+        path = tmp_path / "seen.bin"
+        previous = BloomFilter()
+        previous.add("seen before")
+        previous.save(path)
+
+        scraper = DouyinScraperPro(seen_file=path)
+        page = AsyncMock()
+        page.evaluate.return_value = [
+            {"text": "seen before"},
+            {"text": "new one", "likes": 3},
+            {"text": "new one"},
+        ]
+
+        assert await scraper._scroll_and_extract(page) == 1
+        assert scraper.texts == ["new one"]
+        assert list(scraper.likes) == [3]
+
+
+class TestBrowserPool:
+    """Test BrowserPool checkout and recycling."""
+
+    async def _checkout(self, pool):
+        async with pool.acquire() as context:
+            return context
+
+    async def test_recycles_after_max_uses(self, pool):
+        """Test that a context is closed and replaced after its last use."""
+        pool._contexts.put_nowait(await pool._new_context())
+
+        first = await self._checkout(pool)
+        assert await self._checkout(pool) is first
+        first.close.assert_awaited_once()
+
+        replacement = await self._checkout(pool)
+        assert replacement is not first
+        assert pool.created == [first, replacement]
+
+    async def test_failed_replacement_keeps_slot(self, pool):
+        """Test that a failing context factory does not shrink the pool."""
+        pool._contexts.put_nowait(await pool._new_context())
+        await self._checkout(pool)
+        await self._checkout(pool)
+
+        pool.fail_next = True
+        with pytest.raises(RuntimeError, match="browser crashed"):
+            await self._checkout(pool)
+
+        assert pool._contexts.qsize() == 1
+        assert await self._checkout(pool) is pool.created[-1]
+
+    async def test_failed_close_does_not_lose_slot(self, pool):
+        """Test that an error closing a recycled context is contained."""
+        context = await pool._new_context()
+        context.close.side_effect = RuntimeError("already closed")
+        pool._contexts.put_nowait(context)
+
+        await self._checkout(pool)
+        await self._checkout(pool)
+
+        assert pool._contexts.qsize() == 1
+
+
+class _FakePool:
+    """Pool handing out a context whose pages serve canned comment batches."""
+
+    user_agent = "test-agent"
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.page = MagicMock()
+        for name in ("goto", "wait_for_selector", "wait_for_function", "close"):
+            setattr(self.page, name, AsyncMock())
+        self.page.evaluate = AsyncMock(side_effect=self._next_batch)
+
+    async def _next_batch(self, script):
+        url = self.page.goto.call_args.args[0]
+        queue = self.batches[url]
+        return queue.pop(0) if queue else []
+
+    @asynccontextmanager
+    async def acquire(self):
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=self.page)
+        yield context
+
+
+class TestDouyinScraperPro:
+    """Test DouyinScraperPro across scrapes."""
+
+    async def test_each_scrape_returns_only_its_own_comments(self, monkeypatch):
+        """Test that one entered scraper keeps videos' results separate."""
+        first = "https://www.douyin.com/video/1"
+        second = "https://www.douyin.com/video/2"
+        pool = _FakePool(
+            {
+                first: [[{"text": "first a"}, {"text": "shared"}]],
+                second: [[{"text": "second a"}, {"text": "shared"}]],
+            }
+        )
+        scraper = DouyinScraperPro(pool=pool)
+        monkeypatch.setattr(scraper, "_handle_page_elements", AsyncMock())
+        monkeypatch.setattr(scraper, "_write_json", MagicMock())
+
+        async with scraper:
+            result1 = await scraper.scrape(first, max_comments=2)
+            result2 = await scraper.scrape(second, max_comments=2)
+
+        assert [c["text"] for c in result1["comments"]] == ["first a", "shared"]
+        assert [c["text"] for c in result2["comments"]] == ["second a", "shared"]
+        assert result2["total_comments"] == 2
@@ -0,0 +1,23 @@
+"""Test LLM result cache."""
+
+from tiktok_comment_scraper.llm.cache import ResultCache
+
+
+class TestResultCache:
+    """Test ResultCache class."""
+
+    def test_miss_returns_none(self, tmp_path):
+        """Test that unknown keys are a miss."""
+        cache = ResultCache(str(tmp_path))
+        assert cache.get("missing") is None
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that stored values survive reopening the cache."""
+        cache = ResultCache(str(tmp_path))
+        cache.set("k", {"sentiment": "positive", "key_points": ["好"]})
+        cache.close()
+
+        reopened = ResultCache(str(tmp_path))
+        assert reopened.get("k") == {"sentiment": "positive", "key_points": ["好"]}
+        reopened.close()
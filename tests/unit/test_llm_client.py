@@ -1,10 +1,12 @@
 """Test LLM client."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+from tiktok_comment_scraper.llm.cache import ResultCache
 from tiktok_comment_scraper.llm.client import LLMClient
 from tiktok_comment_scraper.models.comment import (
     Comment,
@@ -16,10 +18,9 @@ from tiktok_comment_scraper.models.comment import (
 @pytest.fixture
 def mock_client():
     """Create mock LLM client."""
-    with patch("tiktok_comment_scraper.llm.client.ZaiClient"):
-        client = LLMClient(api_key="test_key")
-        client.client = MagicMock()
-        return client
+    client = LLMClient(api_key="test_key")
+    client.client = MagicMock()
+    return client
 
 
 @pytest.fixture
@@ -41,17 +42,16 @@ class TestLLMClient:
 
     def test_initialization(self):
         """Test client initialization."""
-        with patch("tiktok_comment_scraper.llm.client.ZaiClient"):
-            client = LLMClient(api_key="test_key", base_url="https://test.com")
-            assert client.api_key == "test_key"
-            assert client.base_url == "https://test.com"
-            assert client.model == "glm-4.7"
+        client = LLMClient(api_key="test_key", base_url="https://test.com")
+        assert client.api_key == "test_key"
+        assert client.base_url == "https://test.com"
+        assert client.model == "glm-4.7"
 
-    def test_import_error_without_sdk(self):
+    def test_import_error_without_sdk(self, monkeypatch):
         """Test that ImportError is raised without SDK."""
-        with patch("tiktok_comment_scraper.llm.client.ZaiClient", None):
-            with pytest.raises(ImportError):
-                LLMClient(api_key="test_key")
+        monkeypatch.setattr("tiktok_comment_scraper.llm.client.ZaiClient", None)
+        with pytest.raises(ImportError):
+            LLMClient(api_key="test_key")
 
     def test_analyze_sentiment_success(self, mock_client, sample_comment):
         """Test successful sentiment analysis."""
@@ -89,6 +89,36 @@ class TestLLMClient:
         assert result["sentiment"] == Sentiment.POSITIVE
         assert result["confidence"] == 0.95
 
+    def test_analyze_sentiment_with_surrounding_text(
+        self, mock_client, sample_comment
+    ):
+        """Test parsing a JSON object embedded in prose."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = (
+            'Here is the analysis: {"sentiment": "question", "confidence": 0.6} '
+            "Let me know if you need more."
+        )
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        result = mock_client.analyze_sentiment(sample_comment)
+
+        assert result["sentiment"] == Sentiment.QUESTION
+        assert result["confidence"] == 0.6
+
+    def test_analyze_sentiment_with_trailing_braces(self, mock_client, sample_comment):
+        """Test parsing when prose after the JSON object contains braces."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = (
+            '{"sentiment": "negative", "confidence": 0.7, "summary": "a {b}"} '
+            "(scale: {0-1})"
+        )
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        result = mock_client.analyze_sentiment(sample_comment)
+
+        assert result["sentiment"] == Sentiment.NEGATIVE
+        assert result["summary"] == "a {b}"
+
     def test_analyze_sentiment_json_parse_error(self, mock_client, sample_comment):
         """Test handling of invalid JSON response."""
         mock_response = MagicMock()
@@ -101,6 +131,50 @@ class TestLLMClient:
         assert result["confidence"] == 0.0
         assert "error" in result
 
+    def test_analyze_sentiment_uses_cache(
+        self, mock_client, sample_comment, tmp_path
+    ):
+        """Test that identical comment text is only sent to the LLM once."""
+        mock_client.cache = ResultCache(str(tmp_path))
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = (
+            '{"sentiment": "positive", "confidence": 0.9}'
+        )
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        first = mock_client.analyze_sentiment(sample_comment)
+        second = mock_client.analyze_sentiment(sample_comment)
+
+        assert first == second
+        assert second["sentiment"] == Sentiment.POSITIVE
+        mock_client.client.chat.completions.create.assert_called_once()
+
+    def test_analyze_sentiment_memoizes_duplicate_text(
+        self, mock_client, sample_comment
+    ):
+        """Test that duplicate text is answered in memory without a cache dir."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = (
+            '{"sentiment": "positive", "confidence": 0.9}'
+        )
+        mock_client.client.chat.completions.create.return_value = mock_response
+        duplicate = sample_comment.model_copy(
+            update={"comment_id": "c2", "text": "  This is a great   video! "}
+        )
+
+        first = mock_client.analyze_sentiment(sample_comment)
+        second = mock_client.analyze_sentiment(duplicate)
+
+        assert first == second
+        assert mock_client.client.chat.completions.create.call_count == 1
+
+    def test_cache_key_keeps_case(self, mock_client):
+        """Test that texts differing only in case are analyzed separately."""
+        assert mock_client._normalize_text("  GREAT \n video ") == "GREAT video"
+        assert mock_client._cache_key(
+            mock_client._normalize_text("GREAT")
+        ) != mock_client._cache_key(mock_client._normalize_text("great"))
+
     def test_summarize_comments(self, mock_client, sample_comment):
         """Test comment summarization."""
         mock_response = MagicMock()
@@ -112,7 +186,7 @@ class TestLLMClient:
         assert summary == "这是一段评论摘要..."
         mock_client.client.chat.completions.create.assert_called_once()
 
-    def test_batch_analyze(self, mock_client):
+    async def test_batch_analyze(self, mock_client, monkeypatch):
         """Test batch analysis of comments."""
         author = CommentAuthor(username="testuser", user_id="123")
         comments = [
@@ -126,27 +200,27 @@ class TestLLMClient:
             for i in range(3)
         ]
 
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = '''{
-    "sentiment": "neutral",
-    "confidence": 0.8,
-    "key_points": [],
-    "summary": "Comment"
-}'''
-        mock_client.client.chat.completions.create.return_value = mock_response
-
-        with patch.object(mock_client, "analyze_sentiment") as mock_analyze:
-            mock_analyze.return_value = {
+        batch_result = [
+            {
+                "comment_id": c.comment_id,
                 "sentiment": Sentiment.NEUTRAL,
                 "confidence": 0.8,
-                "key_points": [],
             }
-            results = mock_client.batch_analyze(comments, batch_size=2)
+            for c in comments
+        ]
+
+        mock_batch = MagicMock(return_value=batch_result)
+        mock_analyze = MagicMock()
+        monkeypatch.setattr(mock_client, "analyze_sentiments_batch", mock_batch)
+        monkeypatch.setattr(mock_client, "analyze_sentiment", mock_analyze)
+
+        results = await mock_client.batch_analyze_async(comments, batch_size=3)
 
-            assert len(results) == 3
-            assert mock_analyze.call_count == 3
+        assert len(results) == 3
+        assert mock_batch.call_count == 1
+        assert mock_analyze.call_count == 0
 
-    def test_batch_analyze_with_error(self, mock_client, sample_comment):
+    async def test_batch_analyze_with_error(self, mock_client, sample_comment, monkeypatch):
         """Test batch analysis with error handling."""
         mock_response = MagicMock()
         mock_response.choices[0].message.content = '''{
@@ -157,13 +231,183 @@ class TestLLMClient:
 }'''
         mock_client.client.chat.completions.create.return_value = mock_response
 
-        with patch.object(
-            mock_client, "analyze_sentiment", side_effect=RuntimeError("API Error")
-        ):
-            results = mock_client.batch_analyze([sample_comment])
+        monkeypatch.setattr(
+            mock_client,
+            "analyze_sentiment",
+            MagicMock(side_effect=RuntimeError("API Error")),
+        )
+
+        results = await mock_client.batch_analyze_async([sample_comment])
+
+        assert len(results) == 1
+        assert "error" in results[0]
+
+    async def test_batch_analyze_single_request_per_batch(self, mock_client):
+        """Test that each batch of comments is analyzed in one request."""
+        author = CommentAuthor(username="testuser", user_id="123")
+        comments = [
+            Comment(
+                comment_id=f"c{i}",
+                video_id="v1",
+                text=f"Comment {i}",
+                author=author,
+                created_at=datetime.now(),
+            )
+            for i in range(3)
+        ]
+
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = """```json
+[
+    {"sentiment": "positive", "confidence": 0.9, "key_points": [], "summary": "a"},
+    {"sentiment": "question", "confidence": 0.7, "key_points": [], "summary": "b"},
+    {"sentiment": "negative", "confidence": 0.8, "key_points": [], "summary": "c"}
+]
+```"""
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        results = await mock_client.batch_analyze_async(comments, batch_size=3)
+
+        mock_client.client.chat.completions.create.assert_called_once()
+        assert [r["comment_id"] for r in results] == ["c0", "c1", "c2"]
+        assert [r["sentiment"] for r in results] == [
+            Sentiment.POSITIVE,
+            Sentiment.QUESTION,
+            Sentiment.NEGATIVE,
+        ]
+
+    def test_batch_analyze_sync_shim(self, mock_client, sample_comment, monkeypatch):
+        """Test the synchronous wrapper around batch_analyze_async."""
+        monkeypatch.setattr(
+            mock_client, "analyze_sentiments_batch", MagicMock(return_value=[{}])
+        )
+
+        # asyncio.run() clears the current loop of the thread it runs in, so
+        # keep it off the thread that owns the shared test loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = executor.submit(
+                mock_client.batch_analyze, [sample_comment]
+            ).result()
+
+        assert results == [{}]
+
+    async def test_batch_requests_fit_output_limit(self, mock_client, monkeypatch):
+        """Test that request batches are capped by the output token limit."""
+        author = CommentAuthor(username="testuser", user_id="123")
+        comments = [
+            Comment(
+                comment_id=f"c{i}",
+                video_id="v1",
+                text=f"Comment {i}",
+                author=author,
+                created_at=datetime.now(),
+            )
+            for i in range(30)
+        ]
+        sizes = []
+
+        def fake_batch(batch):
+            sizes.append(len(batch))
+            return [{"comment_id": c.comment_id} for c in batch]
+
+        monkeypatch.setattr(mock_client, "analyze_sentiments_batch", fake_batch)
+
+        results = await mock_client.batch_analyze_async(comments, batch_size=50)
+
+        assert len(results) == 30
+        assert sizes == [13, 13, 4]
+
+    def test_batch_request_caps_max_tokens(self, mock_client, sample_comment):
+        """Test that a large batch never asks for more than the token limit."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Not valid JSON"
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        mock_client._request_sentiments_batch([sample_comment] * 50)
+
+        kwargs = mock_client.client.chat.completions.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 4096
+
+    def test_batch_response_with_unknown_label_is_kept(
+        self, mock_client, sample_comment
+    ):
+        """Test that an unrecognised label only affects its own item."""
+        response_text = (
+            '[{"sentiment": "Mixed", "confidence": 0.5},'
+            ' {"sentiment": " Positive ", "confidence": 0.9}]'
+        )
+
+        results = mock_client._parse_batch_sentiment_response(
+            response_text, [sample_comment, sample_comment]
+        )
+
+        assert [r["sentiment"] for r in results] == [
+            Sentiment.NEUTRAL,
+            Sentiment.POSITIVE,
+        ]
+
+    def test_batch_response_with_invalid_result_is_rejected(
+        self, mock_client, sample_comment
+    ):
+        """Test that an out-of-range batch result is not accepted."""
+        response_text = '[{"sentiment": "positive", "confidence": 1.5}]'
+
+        assert (
+            mock_client._parse_batch_sentiment_response(response_text, [sample_comment])
+            is None
+        )
+
+    def test_to_analysis_results(self):
+        """Test validating raw results into models, dropping invalid ones."""
+        results = LLMClient.to_analysis_results(
+            [
+                {"comment_id": "c1", "sentiment": "positive", "confidence": 0.9},
+                {"comment_id": "c2", "sentiment": None, "confidence": 0.5},
+            ]
+        )
+
+        assert [r.comment_id for r in results] == ["c1"]
+        assert results[0].sentiment == Sentiment.POSITIVE
+
+    async def test_batch_analyze_async_preserves_order(self, mock_client, monkeypatch):
+        """Test concurrent batch analysis keeps results aligned with input."""
+        author = CommentAuthor(username="testuser", user_id="123")
+        comments = [
+            Comment(
+                comment_id=f"c{i}",
+                video_id="v1",
+                text=f"Comment {i}",
+                author=author,
+                created_at=datetime.now(),
+            )
+            for i in range(5)
+        ]
+
+        # An unparseable batch response falls back to per-comment analysis
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Not valid JSON"
+        mock_client.client.chat.completions.create.return_value = mock_response
+
+        def analyze(comment):
+            if comment.comment_id == "c2":
+                raise RuntimeError("API Error")
+            return {"summary": comment.text}
 
-            assert len(results) == 1
-            assert "error" in results[0]
+        monkeypatch.setattr(mock_client, "analyze_sentiment", analyze)
+
+        results = await mock_client.batch_analyze_async(
+            comments, batch_size=2, concurrency=2
+        )
+
+        assert [r.get("summary") for r in results] == [
+            "Comment 0",
+            "Comment 1",
+            None,
+            "Comment 3",
+            "Comment 4",
+        ]
+        assert results[2]["comment_id"] == "c2"
+        assert "error" in results[2]
 
     def test_retry_on_timeout(self, mock_client, sample_comment):
         """Test retry logic on timeout."""
@@ -3,6 +3,7 @@
 from datetime import datetime
 
 import pytest
+from pydantic import TypeAdapter, ValidationError
 
 from tiktok_comment_scraper.models.comment import (
     AnalysisResult,
@@ -13,6 +14,63 @@ from tiktok_comment_scraper.models.comment import (
     VideoSummary,
 )
 
+CREATED_AT = datetime(2023, 1, 1)
+
+_ANALYSIS_RESULT_ADAPTER = TypeAdapter(AnalysisResult)
+
+
+@pytest.fixture(scope="module")
+def author():
+    """Create a shared comment author."""
+    return CommentAuthor(username="testuser", user_id="123")
+
+
+@pytest.fixture(scope="module")
+def base_comment(author):
+    """Create a shared comment to derive other comments from."""
+    return Comment(
+        comment_id="c1",
+        video_id="v1",
+        text="x",
+        author=author,
+        created_at=CREATED_AT,
+    )
+
+
+@pytest.fixture(scope="module")
+def totals_thread(base_comment):
+    """Create a thread with one reply and its totals calculated."""
+    main_comment = base_comment.model_copy(
+        update={"text": "Main comment", "like_count": 10, "reply_count": 5}
+    )
+    reply1 = base_comment.model_copy(
+        update={
+            "comment_id": "r1",
+            "text": "Reply 1",
+            "like_count": 5,
+            "parent_comment_id": "c1",
+        }
+    )
+    thread = CommentThread(main_comment=main_comment, replies=[reply1])
+    thread.calculate_totals()
+    return thread
+
+
+@pytest.fixture(scope="module")
+def distribution_summary(base_comment):
+    """Create a summary with its sentiment distribution calculated."""
+    comment1 = base_comment.model_copy(update={"text": "Great"})
+    comment2 = base_comment.model_copy(update={"comment_id": "c2", "text": "Bad"})
+    summary = VideoSummary(
+        video_id="v1", total_comments=2, comments=[comment1, comment2]
+    )
+    summary.analysis_results = [
+        AnalysisResult(comment_id="c1", sentiment=Sentiment.POSITIVE, confidence=0.9),
+        AnalysisResult(comment_id="c2", sentiment=Sentiment.NEGATIVE, confidence=0.8),
+    ]
+    summary.calculate_sentiment_distribution()
+    return summary
+
 
 class TestCommentAuthor:
     """Test CommentAuthor model."""
@@ -41,15 +99,14 @@ class TestCommentAuthor:
 class TestComment:
     """Test Comment model."""
 
-    def test_create_comment_minimal(self):
+    def test_create_comment_minimal(self, author):
         """Test creating comment with minimal data."""
-        author = CommentAuthor(username="testuser", user_id="123")
         comment = Comment(
             comment_id="c1",
             video_id="v1",
             text="Test comment",
             author=author,
-            created_at=datetime.now(),
+            created_at=CREATED_AT,
         )
         assert comment.comment_id == "c1"
         assert comment.text == "Test comment"
@@ -57,28 +114,26 @@ class TestComment:
         assert comment.reply_count == 0
         assert comment.sentiment is None
 
-    def test_create_comment_with_parent(self):
+    def test_create_comment_with_parent(self, author):
         """Test creating reply comment with parent."""
-        author = CommentAuthor(username="testuser", user_id="123")
         comment = Comment(
             comment_id="c2",
             video_id="v1",
             text="Reply",
             author=author,
-            created_at=datetime.now(),
+            created_at=CREATED_AT,
             parent_comment_id="c1",
         )
         assert comment.parent_comment_id == "c1"
 
-    def test_set_sentiment(self):
+    def test_set_sentiment(self, author):
         """Test setting sentiment on comment."""
-        author = CommentAuthor(username="testuser", user_id="123")
         comment = Comment(
             comment_id="c1",
             video_id="v1",
             text="Great video!",
             author=author,
-            created_at=datetime.now(),
+            created_at=CREATED_AT,
             sentiment=Sentiment.POSITIVE,
         )
         assert comment.sentiment == Sentiment.POSITIVE
@@ -87,79 +142,45 @@ class TestComment:
 class TestCommentThread:
     """Test CommentThread model."""
 
-    def test_create_thread_empty(self):
+    def test_create_thread_empty(self, base_comment):
         """Test creating thread without replies."""
-        author = CommentAuthor(username="testuser", user_id="123")
-        main_comment = Comment(
-            comment_id="c1",
-            video_id="v1",
-            text="Main comment",
-            author=author,
-            created_at=datetime.now(),
-            like_count=10,
-            reply_count=2,
+        main_comment = base_comment.model_copy(
+            update={"text": "Main comment", "like_count": 10, "reply_count": 2}
         )
         thread = CommentThread(main_comment=main_comment)
         assert thread.main_comment.comment_id == "c1"
         assert len(thread.replies) == 0
 
-    def test_create_thread_with_replies(self):
+    def test_create_thread_with_replies(self, base_comment):
         """Test creating thread with replies."""
-        author = CommentAuthor(username="testuser", user_id="123")
-        main_comment = Comment(
-            comment_id="c1",
-            video_id="v1",
-            text="Main comment",
-            author=author,
-            created_at=datetime.now(),
-            like_count=10,
+        main_comment = base_comment.model_copy(
+            update={"text": "Main comment", "like_count": 10}
         )
-        reply1 = Comment(
-            comment_id="r1",
-            video_id="v1",
-            text="Reply 1",
-            author=author,
-            created_at=datetime.now(),
-            like_count=5,
-            parent_comment_id="c1",
+        reply1 = base_comment.model_copy(
+            update={
+                "comment_id": "r1",
+                "text": "Reply 1",
+                "like_count": 5,
+                "parent_comment_id": "c1",
+            }
         )
-        reply2 = Comment(
-            comment_id="r2",
-            video_id="v1",
-            text="Reply 2",
-            author=author,
-            created_at=datetime.now(),
-            like_count=3,
-            parent_comment_id="c1",
+        reply2 = base_comment.model_copy(
+            update={
+                "comment_id": "r2",
+                "text": "Reply 2",
+                "like_count": 3,
+                "parent_comment_id": "c1",
+            }
         )
         thread = CommentThread(main_comment=main_comment, replies=[reply1, reply2])
         assert len(thread.replies) == 2
 
-    def test_calculate_totals(self):
+    @pytest.mark.parametrize(
+        "field,expected", [("total_like_count", 15), ("total_reply_count", 6)]
+    )
+    def test_calculate_totals(self, totals_thread, field, expected):
         """Test calculating total likes and replies."""
-        author = CommentAuthor(username="testuser", user_id="123")
-        main_comment = Comment(
-            comment_id="c1",
-            video_id="v1",
-            text="Main comment",
-            author=author,
-            created_at=datetime.now(),
-            like_count=10,
-            reply_count=5,
-        )
-        reply1 = Comment(
-            comment_id="r1",
-            video_id="v1",
-            text="Reply 1",
-            author=author,
-            created_at=datetime.now(),
-            like_count=5,
-            parent_comment_id="c1",
-        )
-        thread = CommentThread(main_comment=main_comment, replies=[reply1])
-        thread.calculate_totals()
-        assert thread.total_like_count == 15
-        assert thread.total_reply_count == 6
+        assert getattr(totals_thread, field) == expected
 
 
 class TestAnalysisResult:
@@ -181,54 +202,27 @@ class TestAnalysisResult:
 
     def test_confidence_bounds(self):
         """Test that confidence must be between 0 and 1."""
-        from pydantic import ValidationError
-
-        with pytest.raises(ValidationError):
-            AnalysisResult(comment_id="c1", sentiment=Sentiment.POSITIVE, confidence=1.5)
+        with pytest.raises(ValidationError) as exc_info:
+            _ANALYSIS_RESULT_ADAPTER.validate_python(
+                {"comment_id": "c1", "sentiment": Sentiment.POSITIVE, "confidence": 1.5}
+            )
+        assert exc_info.value.errors()[0]["type"] == "less_than_equal"
 
 
 class TestVideoSummary:
     """Test VideoSummary model."""
 
-    def test_create_summary(self):
+    def test_create_summary(self, base_comment):
         """Test creating video summary."""
-        author = CommentAuthor(username="testuser", user_id="123")
-        comment = Comment(
-            comment_id="c1",
-            video_id="v1",
-            text="Test",
-            author=author,
-            created_at=datetime.now(),
-        )
+        comment = base_comment.model_copy(update={"text": "Test"})
         summary = VideoSummary(video_id="v1", total_comments=1, comments=[comment])
         assert summary.video_id == "v1"
         assert summary.total_comments == 1
         assert len(summary.comments) == 1
 
-    def test_sentiment_distribution(self):
+    @pytest.mark.parametrize(
+        "sentiment,expected", [("positive", 1), ("negative", 1), ("neutral", None)]
+    )
+    def test_sentiment_distribution(self, distribution_summary, sentiment, expected):
         """Test calculating sentiment distribution."""
-        author = CommentAuthor(username="testuser", user_id="123")
-        comment1 = Comment(
-            comment_id="c1",
-            video_id="v1",
-            text="Great",
-            author=author,
-            created_at=datetime.now(),
-        )
-        comment2 = Comment(
-            comment_id="c2",
-            video_id="v1",
-            text="Bad",
-            author=author,
-            created_at=datetime.now(),
-        )
-        summary = VideoSummary(
-            video_id="v1", total_comments=2, comments=[comment1, comment2]
-        )
-        summary.analysis_results = [
-            AnalysisResult(comment_id="c1", sentiment=Sentiment.POSITIVE, confidence=0.9),
-            AnalysisResult(comment_id="c2", sentiment=Sentiment.NEGATIVE, confidence=0.8),
-        ]
-        summary.calculate_sentiment_distribution()
-        assert summary.sentiment_distribution["positive"] == 1
-        assert summary.sentiment_distribution["negative"] == 1
+        assert distribution_summary.sentiment_distribution.get(sentiment) == expected
@@ -1,8 +1,11 @@
 """Test TikTok scraper."""
 
+import asyncio
+import json
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
 from tiktok_comment_scraper.models.comment import Comment, CommentAuthor
@@ -12,6 +15,16 @@ from tiktok_comment_scraper.scraper.tiktok import (
 )
 
 
+class _Resp:
+    """Minimal stand-in for an httpx response."""
+
+    __slots__ = ("status_code", "content")
+
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+
+
 @pytest.fixture
 def scraper():
     """Create TikTokScraper instance."""
@@ -24,29 +37,145 @@ def api_scraper():
     return TikTokAPIScraper()
 
 
+@pytest.fixture
+def mock_async_client(monkeypatch):
+    """Replace httpx.AsyncClient with a factory returning one shared mock."""
+    mock_client = AsyncMock()
+    mock_client.__aenter__.return_value = mock_client
+    monkeypatch.setattr("httpx.AsyncClient", MagicMock(return_value=mock_client))
+    return mock_client
+
+
+@pytest.fixture
+def browser_scraper():
+    """Create a TikTokScraper whose context hands out one mock page."""
+    scraper = TikTokScraper(headless=True)
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/@user/video/123"
+    for name in ("goto", "wait_for_selector", "wait_for_timeout", "close"):
+        setattr(page, name, AsyncMock())
+    page.content = AsyncMock(return_value="")
+    page.evaluate = AsyncMock(return_value=[])
+    page.keyboard.press = AsyncMock()
+    page.locator.return_value.first.scroll_into_view_if_needed = AsyncMock()
+    scraper.context = MagicMock()
+    scraper.context.new_page = AsyncMock(return_value=page)
+    return scraper, page
+
+
+@pytest.fixture(scope="session")
+def scraper_instances():
+    """Create one instance of each scraper for stateless helper tests."""
+    return (TikTokScraper(headless=True), TikTokAPIScraper())
+
+
+VIDEO_ID_CASES = [
+    ("https://www.tiktok.com/@user/video/1234567890?test=1", "1234567890"),
+    ("https://www.tiktok.com/@user/video/1234567890", "1234567890"),
+    ("https://www.tiktok.com/@user.name/video/7301234567", "7301234567"),
+    ("https://m.tiktok.com/v/video/42?lang=en&is_copy_url=1", "42"),
+    ("https://www.douyin.com/video/7211111111", "7211111111"),
+    ("https://www.douyin.com/video/7211111111?previous_page=app", "7211111111"),
+    ("https://www.tiktok.com/@user/video/abc123", "abc123"),
+    ("http://tiktok.com/@u/video/9", "9"),
+    ("https://www.tiktok.com/@user", None),
+    ("https://www.example.com/page", None),
+    ("https://www.douyin.com/user/MS4wLjABAAAA?modal_id=123", None),
+    ("", None),
+]
+
+
+@pytest.mark.parametrize("idx,missing", [(0, "unknown_video"), (1, "")])
+def test_extract_video_ids(scraper_instances, idx, missing):
+    """Test single and batched video ID extraction for both scrapers."""
+    scraper = scraper_instances[idx]
+    urls = [url for url, _ in VIDEO_ID_CASES]
+    expected = [video_id or missing for _, video_id in VIDEO_ID_CASES]
+
+    assert scraper._extract_video_ids(urls) == expected
+    assert [scraper._extract_video_id(url) for url in urls] == expected
+
+
 class TestTikTokScraper:
     """Test TikTokScraper class."""
 
-    @pytest.mark.asyncio
     async def test_initialization(self):
         """Test scraper initialization."""
         scraper = TikTokScraper(user_agent="custom_ua")
         assert scraper.user_agent == "custom_ua"
         assert scraper.headless is True
 
-    def test_extract_video_id(self):
-        """Test video ID extraction."""
+    async def test_scrape_many(self):
+        """Test concurrent scraping is bounded and keyed by URL."""
         scraper = TikTokScraper(headless=True)
-        video_id = scraper._extract_video_id(
-            "https://www.tiktok.com/@user/video/1234567890?test=1"
-        )
-        assert video_id == "1234567890"
+        active = 0
+        peak = 0
+
+        async def fake_scrape(video_url, max_comments=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [video_url]
+
+        scraper.scrape_video_comments = fake_scrape
+        urls = [f"https://www.tiktok.com/@user/video/{i}" for i in range(5)]
+
+        results = await scraper.scrape_many(urls, concurrency=2)
 
-    def test_extract_video_id_invalid(self):
-        """Test video ID extraction with invalid URL."""
+        assert list(results) == urls
+        assert all(results[url] == [url] for url in urls)
+        assert peak == 2
+
+    async def test_scrape_many_isolates_failures(self):
+        """Test that one failing video does not lose the others' results."""
         scraper = TikTokScraper(headless=True)
-        video_id = scraper._extract_video_id("https://www.example.com/page")
-        assert video_id == "unknown_video"
+
+        async def fake_scrape(video_url, max_comments=None):
+            if video_url.endswith("/1"):
+                raise RuntimeError("blocked")
+            await asyncio.sleep(0.01)
+            return [video_url]
+
+        scraper.scrape_video_comments = fake_scrape
+        urls = [f"https://www.tiktok.com/@user/video/{i}" for i in range(3)]
+
+        results = await scraper.scrape_many(urls, concurrency=3)
+
+        assert results[urls[0]] == [urls[0]]
+        assert isinstance(results[urls[1]], RuntimeError)
+        assert results[urls[2]] == [urls[2]]
+
+    async def test_scrape_video_comments_closes_page(self, browser_scraper):
+        """Test DOM scraping stops at max_comments and closes its page."""
+        scraper, page = browser_scraper
+        page.evaluate.side_effect = [
+            [{"text": "nice", "author": "a", "likes": 2}],
+            [{"text": "cool", "author": "b"}],
+            [{"text": "late", "author": "c"}],
+        ]
+
+        comments = await scraper.scrape_video_comments(page.url, max_comments=2)
+
+        assert [c.text for c in comments] == ["nice", "cool"]
+        assert [c.comment_id for c in comments] == [
+            "123_comment_0",
+            "123_comment_1",
+        ]
+        assert comments[0].like_count == 2
+        page.close.assert_awaited_once()
+
+    async def test_scrape_video_comments_closes_page_on_error(self, browser_scraper):
+        """Test that the page is closed when navigation fails."""
+        scraper, page = browser_scraper
+        scraper.max_retries = 1
+        page.goto.side_effect = RuntimeError("net::ERR_FAILED")
+
+        with pytest.raises(RuntimeError, match="net::ERR_FAILED"):
+            await scraper.scrape_video_comments(page.url)
+
+        page.close.assert_awaited_once()
 
 
 class TestTikTokAPIScraper:
@@ -57,14 +186,6 @@ class TestTikTokAPIScraper:
         scraper = TikTokAPIScraper(proxy_url="http://proxy.com")
         assert scraper.proxy_url == "http://proxy.com"
 
-    def test_extract_video_id(self):
-        """Test video ID extraction."""
-        scraper = TikTokAPIScraper()
-        video_id = scraper._extract_video_id(
-            "https://www.tiktok.com/@user/video/1234567890"
-        )
-        assert video_id == "1234567890"
-
     def test_parse_comment(self):
         """Test comment parsing from API response."""
         scraper = TikTokAPIScraper()
@@ -117,14 +238,34 @@ class TestTikTokAPIScraper:
         assert comment.parent_comment_id is None
         assert comment.is_pinned is False
 
-    @pytest.mark.asyncio
-    async def test_scrape_video_comments_mock(self):
+    def test_parse_comments_coerces_numeric_ids(self):
+        """Test that numeric IDs from the API are parsed as strings."""
+        scraper = TikTokAPIScraper()
+        rows = [{"cid": 42, "text": "Hi", "reply_to_reply_id": 0}]
+
+        comments = scraper._parse_comments(rows, "video_123")
+
+        assert comments[0].comment_id == "42"
+        assert comments[0].parent_comment_id == "0"
+
+    def test_parse_comments_skips_only_invalid_rows(self):
+        """Test that one malformed row does not drop the rest of the page."""
+        scraper = TikTokAPIScraper()
+        rows = [
+            {"cid": "c1", "text": "First"},
+            {"cid": "c2", "text": None},
+            {"cid": "c3", "text": "Third"},
+        ]
+
+        comments = scraper._parse_comments(rows, "video_123")
+
+        assert [c.comment_id for c in comments] == ["c1", "c3"]
+
+    async def test_scrape_video_comments_mock(self, mock_async_client):
         """Test scraping with mocked HTTP client."""
         scraper = TikTokAPIScraper()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _Resp(200, {
             "comments": [
                 {
                     "cid": "comment_1",
@@ -136,71 +277,97 @@ class TestTikTokAPIScraper:
             ],
             "cursor": "",
             "has_more": False,
-        }
+        })
+        mock_async_client.get = AsyncMock(return_value=mock_response)
+
+        comments = await scraper.scrape_video_comments(
+            "https://www.tiktok.com/@user/video/123", max_comments=10
+        )
 
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.get = AsyncMock(return_value=mock_response)
-            MockClient.return_value = mock_client
+        assert len(comments) == 1
+        assert comments[0].text == "Comment 1"
 
-            comments = await scraper.scrape_video_comments(
-                "https://www.tiktok.com/@user/video/123", max_comments=10
-            )
+    async def test_context_manager_reuses_client(self, mock_async_client):
+        """Test entered scraper shares one client across videos."""
+        mock_async_client.get = AsyncMock(return_value=_Resp(404))
 
-            assert len(comments) == 1
-            assert comments[0].text == "Comment 1"
+        async with TikTokAPIScraper() as scraper:
+            await scraper.scrape_video_comments("https://www.tiktok.com/@user/video/1")
+            await scraper.scrape_video_comments("https://www.tiktok.com/@user/video/2")
 
-    @pytest.mark.asyncio
-    async def test_scrape_video_comments_error(self):
+        assert httpx.AsyncClient.call_count == 1
+        assert httpx.AsyncClient.call_args.kwargs["http2"] is True
+        assert mock_async_client.get.call_count == 2
+        mock_async_client.__aexit__.assert_awaited_once()
+        assert scraper._client is None
+
+    async def test_scrape_video_comments_error(self, mock_async_client):
         """Test scraping with API error."""
         scraper = TikTokAPIScraper()
+        mock_async_client.get = AsyncMock(side_effect=Exception("API Error"))
+
+        comments = await scraper.scrape_video_comments(
+            "https://www.tiktok.com/@user/video/123"
+        )
+
+        assert len(comments) == 0
+
+    async def test_abandoned_prefetch_is_awaited(
+        self, mock_async_client, monkeypatch
+    ):
+        """Test that a prefetch still in flight is cancelled and awaited."""
+        scraper = TikTokAPIScraper()
+        first = _Resp(
+            200, {"comments": [{"cid": "c1"}], "cursor": "c1", "has_more": True}
+        )
+        tasks = []
+        create_task = asyncio.create_task
 
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.get = AsyncMock(side_effect=Exception("API Error"))
-            MockClient.return_value = mock_client
+        async def get(url, params, headers):
+            if params["cursor"] != "0":
+                await asyncio.Event().wait()
+            return first
 
-            comments = await scraper.scrape_video_comments(
-                "https://www.tiktok.com/@user/video/123"
-            )
+        def track(coro):
+            tasks.append(create_task(coro))
+            return tasks[-1]
 
-            assert len(comments) == 0
+        def broken_parse(rows, video_id):
+            raise ValueError("bad page")
 
-    @pytest.mark.asyncio
-    async def test_scrape_video_comments_pagination(self):
+        mock_async_client.get = get
+        monkeypatch.setattr(asyncio, "create_task", track)
+        monkeypatch.setattr(scraper, "_parse_comments", broken_parse)
+
+        comments = await scraper.scrape_video_comments(
+            "https://www.tiktok.com/@user/video/123"
+        )
+
+        assert comments == []
+        assert len(tasks) == 2
+        assert tasks[1].done() and tasks[1].cancelled()
+
+    async def test_scrape_video_comments_pagination(self, mock_async_client):
         """Test scraping with pagination."""
         scraper = TikTokAPIScraper()
 
         responses = [
-            MagicMock(
-                status_code=200,
-                json=lambda: {
-                    "comments": [{"cid": "c1", "text": "1", "user": {"uid": "1", "unique_id": "u1"}, "create_time": 1672531200}],
-                    "cursor": "cursor1",
-                    "has_more": True,
-                },
-            ),
-            MagicMock(
-                status_code=200,
-                json=lambda: {
-                    "comments": [{"cid": "c2", "text": "2", "user": {"uid": "2", "unique_id": "u2"}, "create_time": 1672531200}],
-                    "cursor": "",
-                    "has_more": False,
-                },
-            ),
+            _Resp(200, {
+                "comments": [{"cid": "c1", "text": "1", "user": {"uid": "1", "unique_id": "u1"}, "create_time": 1672531200}],
+                "cursor": "cursor1",
+                "has_more": True,
+            }),
+            _Resp(200, {
+                "comments": [{"cid": "c2", "text": "2", "user": {"uid": "2", "unique_id": "u2"}, "create_time": 1672531200}],
+                "cursor": "",
+                "has_more": False,
+            }),
         ]
+        mock_async_client.get = AsyncMock(side_effect=responses)
 
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.get = AsyncMock(side_effect=responses)
-            MockClient.return_value = mock_client
-
-            comments = await scraper.scrape_video_comments(
-                "https://www.tiktok.com/@user/video/123"
-            )
+        comments = await scraper.scrape_video_comments(
+            "https://www.tiktok.com/@user/video/123"
+        )
 
-            assert len(comments) == 2
-            assert mock_client.get.call_count == 2
+        assert len(comments) == 2
+        assert mock_async_client.get.call_count == 2
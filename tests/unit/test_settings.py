@@ -1,92 +1,70 @@
 """Test configuration management."""
 
-import os
-from pathlib import Path
-
 import pytest
 from pydantic import ValidationError
 
-from tiktok_comment_scraper.config.settings import Settings, settings
+from tiktok_comment_scraper.config.settings import Settings, get_settings
 
 
 class TestSettings:
     """Test Settings class."""
 
-    def test_load_default_values(self):
+    def test_load_default_values(self, monkeypatch):
         """Test that settings load with default values."""
-        test_env = {
-            "ZAI_API_KEY": "test_api_key",
-        }
-        
-        for key, value in test_env.items():
-            os.environ[key] = value
-        
-        try:
-            s = Settings()
-            assert s.ZAI_API_KEY == "test_api_key"
-            assert s.ZAI_MODEL == "glm-4.7"
-            assert s.ZAI_TIMEOUT == 300
-            assert s.TIKTOK_TIMEOUT == 30
-            assert s.BATCH_SIZE == 50
-        finally:
-            for key in test_env:
-                os.environ.pop(key, None)
-
-    def test_required_api_key(self):
+        monkeypatch.setenv("ZAI_API_KEY", "test_api_key")
+
+        s = Settings()
+        assert s.ZAI_API_KEY == "test_api_key"
+        assert s.ZAI_MODEL == "glm-4.7"
+        assert s.ZAI_TIMEOUT == 300
+        assert s.TIKTOK_TIMEOUT == 30
+        assert s.BATCH_SIZE == 50
+
+    def test_required_api_key(self, monkeypatch):
         """Test that ZAI_API_KEY is required."""
+        monkeypatch.delenv("ZAI_API_KEY", raising=False)
+
         with pytest.raises(ValidationError) as exc_info:
             Settings()
         assert "ZAI_API_KEY" in str(exc_info.value)
 
-    def test_custom_values(self):
+    def test_custom_values(self, monkeypatch):
         """Test that custom values can be set."""
-        test_env = {
-            "ZAI_API_KEY": "custom_key",
-            "ZAI_MODEL": "glm-4.6",
-            "ZAI_TIMEOUT": "600",
-        }
-        
-        for key, value in test_env.items():
-            os.environ[key] = value
-        
-        try:
-            s = Settings()
-            assert s.ZAI_API_KEY == "custom_key"
-            assert s.ZAI_MODEL == "glm-4.6"
-            assert s.ZAI_TIMEOUT == 600
-        finally:
-            for key in test_env:
-                os.environ.pop(key, None)
-
-    def test_singleton_instance(self):
+        monkeypatch.setenv("ZAI_API_KEY", "custom_key")
+        monkeypatch.setenv("ZAI_MODEL", "glm-4.6")
+        monkeypatch.setenv("ZAI_TIMEOUT", "600")
+
+        s = Settings()
+        assert s.ZAI_API_KEY == "custom_key"
+        assert s.ZAI_MODEL == "glm-4.6"
+        assert s.ZAI_TIMEOUT == 600
+
+    def test_singleton_instance(self, monkeypatch):
         """Test that settings is a singleton instance."""
-        test_env = {"ZAI_API_KEY": "singleton_test"}
-        for key, value in test_env.items():
-            os.environ[key] = value
-        
-        try:
-            s1 = settings
-            s2 = settings
-            assert s1 is s2
-        finally:
-            for key in test_env:
-                os.environ.pop(key, None)
-
-    @pytest.mark.integration
-    def test_load_from_env_file(self, tmp_path: Path):
+        monkeypatch.setenv("ZAI_API_KEY", "singleton_test")
+
+        s1 = get_settings()
+        s2 = get_settings()
+        assert s1 is s2
+
+    def test_lazy_module_attribute(self):
+        """Test that the legacy ``settings`` attribute resolves lazily."""
+        from tiktok_comment_scraper.config import settings as settings_module
+
+        assert settings_module.settings is get_settings()
+        # hasattr() only swallows AttributeError; any other error still fails
+        assert not hasattr(settings_module, "missing_setting")
+
+    def test_load_from_env_file(self, monkeypatch, tmp_path):
         """Test loading configuration from .env file."""
+        for key in ("ZAI_API_KEY", "ZAI_MODEL", "BATCH_SIZE"):
+            monkeypatch.delenv(key, raising=False)
         env_file = tmp_path / ".env"
         env_file.write_text(
-            "ZAI_API_KEY=env_file_key\n"
-            "ZAI_MODEL=custom_model\n"
-            "BATCH_SIZE=100\n"
+            "ZAI_API_KEY=env_file_key\nZAI_MODEL=custom_model\nBATCH_SIZE=100\n"
         )
-        
-        os.environ["ZAI_API_KEY"] = "env_file_key"
-        try:
-            s = Settings(_env_file=str(env_file))
-            assert s.ZAI_API_KEY == "env_file_key"
-            assert s.ZAI_MODEL == "custom_model"
-            assert s.BATCH_SIZE == 100
-        finally:
-            os.environ.pop("ZAI_API_KEY", None)
+
+        s = Settings(_env_file=env_file)
+        assert s.ZAI_API_KEY == "env_file_key"
+        assert s.ZAI_MODEL == "custom_model"
+        assert s.BATCH_SIZE == 100